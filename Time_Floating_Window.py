@@ -1,16 +1,47 @@
+import time
+startup_marks = [("start", time.perf_counter())]  # (step, time) pairs for the optional startup report
+
 import tkinter as tk
-import webbrowser
-from tkinter import ttk, colorchooser, messagebox
-from tkinter.font import families
+from tkinter import ttk, messagebox
 import json
-from datetime import datetime, timedelta
 import os
 import ctypes
-import ntplib
 import translation
+from renderers import LabelRenderer, CanvasRenderer
+from clock_engine import ClockEngine, ClockZone, NS_PER_MS, NS_PER_S, next_boundary_ns, tick_step_ns
+from ntp_sync import NTPSyncWorker, split_servers
+from settings_store import SettingsStore, SettingsWatcher
+from offset_history import OffsetHistory
+from fonts import TextMetricsCache, FontCatalog
+from tick_stats import TickStats
+from stopwatch import Stopwatch
+import single_instance
 import sys
-import win32com.client
-import winreg as reg
+from time import perf_counter_ns
+# webbrowser, colorchooser, filedialog, simpledialog, win32com and winreg are imported where they are used,
+# they are only needed for rare actions and slow down the start at login
+
+startup_marks.append(("imports", time.perf_counter()))
+
+IDLE_INTERVAL_MS = 1000  # Slowest refresh while the user is idle
+HIDDEN_INTERVAL_MS = 60000  # Refresh while the window is not visible, in case a Map event is missed
+DRAG_FRAME_MS = 16  # Apply at most one window move per display frame while dragging
+SNAP_DISTANCE = 10  # Snap to a screen edge closer than this many pixels
+REUSE_MAX_DELAY_MS = 100  # Only sync results with a shorter round trip are reused at the next start
+CONFIG_FILE = os.path.join(os.path.dirname(sys.executable), "TimeWindowSettings.json")
+
+class LASTINPUTINFO(ctypes.Structure):
+    _fields_ = [("cbSize", ctypes.c_uint), ("dwTime", ctypes.c_uint)]
+
+def user_idle_ms():
+    # Milliseconds since the last keyboard or mouse input, 0 where it cannot be read
+    if os.name != "nt":
+        return 0
+    info = LASTINPUTINFO()
+    info.cbSize = ctypes.sizeof(info)
+    if not ctypes.windll.user32.GetLastInputInfo(ctypes.byref(info)):
+        return 0
+    return (ctypes.windll.kernel32.GetTickCount() - info.dwTime) & 0xFFFFFFFF
 
 def is_admin():
     try:
@@ -27,22 +58,243 @@ def run_as_admin():
         ctypes.windll.shell32.ShellExecuteW(None, "runas", exe, ' '.join(sys.argv), None, 1)
         sys.exit()
 
+def make_layered(window):
+    # Give an overrideredirect window the layered style used for transparency on Windows
+    if os.name == "nt":
+        hwnd = ctypes.windll.user32.GetParent(window.winfo_id())
+        style = ctypes.windll.user32.GetWindowLongW(hwnd, -20)
+        ctypes.windll.user32.SetWindowLongW(hwnd, -20, style | 0x80000)
+        ctypes.windll.dwmapi.DwmSetWindowAttribute(hwnd, 2, ctypes.byref(ctypes.c_int(2)), 4)
+
+class ExtraClockWindow():
+    # An additional floating clock, rendered from the main clock's tick instead of its own timer
+    def __init__(self, app, config):
+        self.app = app
+        self.config = config  # The entry in settings["clocks"], updated in place
+        self.window = tk.Toplevel(app.root)
+        self.window.title("Floating Clock")
+        self.window.overrideredirect(True)
+        make_layered(self.window)
+        self.label = tk.Label(self.window, text="")
+        self.label.pack(fill="both", expand=True)
+        self.renderer = LabelRenderer(self.label)
+        self.load_config()
+        self.apply_style()
+
+        self.drag_origin = (0, 0)
+        self.drag_pointer = None
+        self.drag_job = None
+        self.drag_moved = False  # Whether the window moved since the button was pressed
+        self.label.bind("<Button-1>", self.drag_start)
+        self.label.bind("<B1-Motion>", self.drag_move)
+        self.label.bind("<ButtonRelease-1>", self.drag_end)
+        self.label.bind("<Button-3>", self.show_context)
+        self.visible = True  # Whether this clock can be seen
+        self.window.bind("<Map>", lambda e: self.set_visible(e, True))
+        self.window.bind("<Unmap>", lambda e: self.set_visible(e, False))
+        self.window.bind("<Visibility>", lambda e: self.set_visible(e, e.state != "VisibilityFullyObscured"))
+        self.window.attributes("-topmost", True)
+        self.editor = None
+
+    def load_config(self):
+        # Read the time offsets of this clock from its settings entry
+        self.prefix = self.config.get("label") or ""
+        if self.prefix:
+            self.prefix += " "
+        self.offset_ns = int(self.config.get("time_excursion", 0)) * NS_PER_MS
+        self.zone = ClockZone(self.config.get("timezone"), self.config.get("utc_offset_minutes"))
+
+    def apply_style(self):
+        # Follow the main clock's font, size and opacity, and its colors unless this clock has its own
+        s = self.app.settings
+        self.label.config(
+            font=(s["font_family"], s["time_font_size"]),
+            bg=self.config.get("bg_color") or s["bg_color"],
+            fg=self.config.get("text_color") or s["text_color"]
+        )
+        self.window.config(bg=self.label.cget("bg"))
+        self.window.attributes("-alpha", s["bg_opacity"])
+        if not self.config.get("last_position"):
+            # Below the main clock, read from its requested geometry since it may not be mapped yet
+            _, x, y = self.app.floating_window.geometry().split("+")
+            self.config["last_position"] = [int(x), int(y) + s["height"]]
+        x, y = self.config["last_position"]
+        self.window.geometry(f"{s['width']}x{s['height']}+{x}+{y}")
+
+    def render(self, now_ns, digits):
+        now_ns += self.offset_ns
+        self.renderer.render(self.prefix + self.app.clock.format(now_ns, digits, self.zone.utc_offset_ns(now_ns)))
+
+    def drag_start(self, e):
+        if self.app.is_movable:
+            self.start = (self.window.winfo_x(), self.window.winfo_y())
+            self.drag_origin = (e.x_root, e.y_root)
+            self.drag_moved = False
+
+    def drag_move(self, e):
+        if self.app.is_movable:
+            self.drag_pointer = (e.x_root, e.y_root)
+            if not self.drag_job:
+                self.drag_job = self.window.after(DRAG_FRAME_MS, self.apply_drag)
+
+    def drag_end(self, e):
+        if self.drag_job:
+            self.window.after_cancel(self.drag_job)
+            self.apply_drag()
+        if self.drag_moved:
+            self.drag_moved = False
+            self.app.save_settings()
+
+    def apply_drag(self):
+        self.drag_job = None
+        if self.drag_pointer is None:
+            return
+        x, y = self.app.constrain_position(self.start[0] + self.drag_pointer[0] - self.drag_origin[0], self.start[1] + self.drag_pointer[1] - self.drag_origin[1])
+        self.drag_pointer = None
+        self.window.geometry(f"+{x}+{y}")
+        self.config["last_position"] = [x, y]
+        self.drag_moved = True
+
+    def set_visible(self, e, visible):
+        # The main clock only ticks slowly while none of the clocks can be seen
+        if e.widget is not self.window or visible == self.visible:
+            return
+        self.visible = visible
+        if visible:
+            self.app.update_time()
+
+    def show_context(self, e):
+        menu = tk.Menu(self.window, tearoff=0)
+        menu.add_command(label=self.app.texts["edit_clock"], command=self.edit)
+        menu.add_command(label=self.app.texts["remove_clock"], command=lambda: self.app.remove_clock(self))
+        menu.post(e.x_root, e.y_root)
+
+    def edit(self):
+        # Small form for the label, time zone, offsets and colors of this clock
+        if self.editor:
+            self.editor.lift()
+            return
+        texts = self.app.texts
+        self.editor = tk.Toplevel(self.window)
+        self.editor.title(texts["edit_clock"])
+        self.editor.resizable(False, False)
+        self.editor.attributes("-topmost", True)
+        self.editor.protocol("WM_DELETE_WINDOW", self.close_editor)
+        entries = {}
+        fields = [("label", texts["clock_label"]), ("timezone", texts["clock_timezone"]),
+                  ("utc_offset_minutes", texts["clock_utc_offset"]), ("time_excursion", texts["time_excursion"])]
+        for r, (key, text) in enumerate(fields):
+            ttk.Label(self.editor, text=text).grid(row=r, column=0, padx=10, pady=5, sticky="w")
+            entries[key] = ttk.Entry(self.editor, width=24)
+            entries[key].insert(0, "" if self.config.get(key) is None else str(self.config[key]))
+            entries[key].grid(row=r, column=1, padx=10, pady=5, sticky="w")
+        colors = {key: self.config.get(key) for key in ("bg_color", "text_color")}
+        color_frame = ttk.Frame(self.editor)
+        color_frame.grid(row=len(fields), column=0, columnspan=2, padx=10, pady=5, sticky="w")
+
+        def pick_color(key):
+            from tkinter import colorchooser
+            c = colorchooser.askcolor(colors[key] or self.app.settings[key], parent=self.editor)[1]
+            if c:
+                colors[key] = c
+
+        ttk.Button(color_frame, text=texts["bg_color"], command=lambda: pick_color("bg_color")).pack(side="left", padx=5)
+        ttk.Button(color_frame, text=texts["text_color"], command=lambda: pick_color("text_color")).pack(side="left", padx=5)
+        ttk.Button(color_frame, text=texts["clock_main_colors"], command=lambda: colors.update(bg_color=None, text_color=None)).pack(side="left", padx=5)
+        button_frame = ttk.Frame(self.editor)
+        button_frame.grid(row=len(fields) + 1, column=0, columnspan=2, padx=10, pady=5, sticky="e")
+        ttk.Button(button_frame, text=texts["confirm"], command=lambda: self.apply_edit(entries, colors)).pack(side="left", padx=5)
+        ttk.Button(button_frame, text=texts["cancel"], command=self.close_editor).pack(side="left", padx=5)
+
+    def apply_edit(self, entries, colors):
+        # Check the form, then store it in the settings entry and show the clock with it
+        values = {key: entry.get().strip() for key, entry in entries.items()}
+        try:
+            utc_offset = int(values["utc_offset_minutes"]) if values["utc_offset_minutes"] else None
+            excursion = int(values["time_excursion"] or 0)
+        except ValueError as e:
+            messagebox.showerror(self.app.texts["error"], str(e), parent=self.editor)
+            return
+        if values["timezone"] and ClockZone(values["timezone"]).zone is None:
+            messagebox.showerror(self.app.texts["error"], self.app.texts["clock_unknown_timezone"].format(zone=values["timezone"]), parent=self.editor)
+            return
+        self.config.update(label=values["label"], timezone=values["timezone"] or None, utc_offset_minutes=utc_offset, time_excursion=excursion, **colors)
+        self.close_editor()
+        self.load_config()
+        self.apply_style()
+        self.app.save_settings()
+        self.app.update_time()
+
+    def close_editor(self):
+        self.editor.destroy()
+        self.editor = None
+
+    def destroy(self):
+        self.window.destroy()
+
 class FloatingClockApp():
-    def __init__(self):
-        self.config_file = os.path.join(os.path.dirname(sys.executable), "TimeWindowSettings.json")
+    def __init__(self, instance=None, command="show"):
+        self.config_file = CONFIG_FILE
         first_run = self.load_settings()
         self.init_language()
+        startup_marks.append(("settings", time.perf_counter()))
         self.root = tk.Tk()
         self.root.withdraw()
+        startup_marks.append(("tk", time.perf_counter()))
+        self.store = SettingsStore(self.config_file, self.root)
+        self.font_catalog = FontCatalog(self.root)
         self.screen_width = self.root.winfo_screenwidth()
         self.screen_height = self.root.winfo_screenheight()
         self.settings.setdefault("max_width", self.screen_width)
         self.settings.setdefault("max_height", self.screen_height)
-        self.settings_window = None  # To track if settings window is open
+        self.settings_window = None  # Built on first open, hidden instead of destroyed when closed
+        self.clock = ClockEngine(self.settings["time_excursion"])
+        self.history = OffsetHistory(os.path.join(os.path.dirname(self.config_file), "TimeWindowSyncHistory.bin"))
+        restored = self.restore_offset()
+        self.stopwatch = Stopwatch()  # Drives the display unless timer_mode is "clock"
+        self.set_timer_mode(self.settings["timer_mode"])
+        self.tick_job = None  # Pending after() id of the next tick
+        self.timer_due_ns = None  # perf_counter time of the next visible change in stopwatch and countdown mode
+        self.extra_clocks = []  # ExtraClockWindow for each entry in settings["clocks"]
+        self.visible = True  # Whether the floating window can be seen
+        self.user_idle = False  # Whether the user has been idle for idle_throttle_minutes
+        self.next_idle_check = 0.0
+        self.tick_stats = None  # TickStats while the tick statistics overlay is shown
+        self.stats_job = None
+        self.ntp_worker = NTPSyncWorker()
+        self.sync_poll_job = None
+        self.sync_status = ("", self.texts["online_sync"])  # Sync status line and sync button text
+        self.auto_sync_job = None
+        self.sync_manual = False  # Manual syncs step the clock, automatic ones slew it
         self.create_window(first_run)
+        self.watcher = SettingsWatcher(self.store, self.reload_settings)
+        self.instance = instance  # single_instance.InstanceServer receiving the commands of later launches
+        if instance:
+            instance.serve(self.root, self.handle_command)
+        if command != "show":
+            self.root.after_idle(self.handle_command, command)
+        elif not restored and self.settings["auto_sync_minutes"] > 0:
+            self.start_sync()
+        startup_marks.append(("window", time.perf_counter()))
+        if self.settings["startup_timing"]:
+            # Idle callbacks run after the pending redraws, so this marks the first paint
+            self.floating_window.after_idle(self.write_startup_report)
+
+    def write_startup_report(self):
+        # Append the duration of each startup step to TimeWindowStartup.log next to the settings file
+        startup_marks.append(("first paint", time.perf_counter()))
+        steps = ", ".join(f"{name} {(t - startup_marks[i][1]) * 1000:.1f} ms" for i, (name, t) in enumerate(startup_marks[1:]))
+        total = (startup_marks[-1][1] - startup_marks[0][1]) * 1000
+        log_file = os.path.join(os.path.dirname(self.config_file), "TimeWindowStartup.log")
+        try:
+            with open(log_file, "a", encoding="utf-8") as f:
+                f.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} {steps}, total {total:.1f} ms\n")
+        except OSError as e:
+            print(e)
 
     def first_run(self):
         # Ask the user if they want to create a desktop shortcut
+        import win32com.client
         desktop = win32com.client.Dispatch("WScript.Shell").SpecialFolders("Desktop")
         if messagebox.askyesno(self.texts["confirm"], self.texts["create_desktop_shortcut_confirm"]):
             self.create_shortcut(desktop)
@@ -55,6 +307,7 @@ class FloatingClockApp():
         # Create a desktop shortcut for the application
         try:
             shortcut_path = os.path.join(path, self.texts["app_name"] + ".lnk")
+            import win32com.client
             shell = win32com.client.Dispatch("WScript.Shell")
             shortcut = shell.CreateShortCut(shortcut_path)
             shortcut.Targetpath = sys.executable
@@ -69,6 +322,21 @@ class FloatingClockApp():
         if os.path.exists(self.config_file):
             with open(self.config_file, "r", encoding="utf-8") as f:
                 self.settings = json.load(f)
+            # Keys added in later versions
+            self.settings.setdefault("ntp_server", "pool.ntp.org")
+            self.settings.setdefault("ntp_timeout", 5)
+            self.settings.setdefault("auto_sync_minutes", 0)
+            self.settings.setdefault("monospace_fonts_only", False)
+            self.settings.setdefault("show_tick_stats", False)
+            self.settings.setdefault("startup_timing", False)
+            self.settings.setdefault("idle_throttle_minutes", 5)
+            self.settings.setdefault("snap_to_edges", True)
+            self.settings.setdefault("keep_inside_screen", False)
+            self.settings.setdefault("clocks", [])
+            self.settings.setdefault("renderer", "label")
+            self.settings.setdefault("timer_mode", "clock")
+            self.settings.setdefault("countdown_seconds", 300)
+            self.settings.setdefault("offset_ttl_minutes", 60)
             return False
         else:
             run_as_admin() # Run as admin at the first run to create shortcuts
@@ -91,21 +359,50 @@ class FloatingClockApp():
                 "settings_window_position": None,
                 "time_excursion": 0,
                 "time_precision_digits": 0,
+                "ntp_server": "pool.ntp.org",
+                "ntp_timeout": 5,
+                "auto_sync_minutes": 0,
+                "monospace_fonts_only": False,
+                "show_tick_stats": False,
+                "startup_timing": False,
+                "idle_throttle_minutes": 5,
+                "snap_to_edges": True,
+                "keep_inside_screen": False,
+                "clocks": [],
+                "renderer": "label",
+                "timer_mode": "clock",
+                "countdown_seconds": 300,
+                "offset_ttl_minutes": 60,
             }
             return True
 
+    def restore_offset(self):
+        # Continue from a recent low-delay sync result, extrapolated with its drift, instead of
+        # querying the servers again. Return whether one was found.
+        if self.settings["offset_ttl_minutes"] <= 0:
+            return False
+        now_ns = time.time_ns()
+        record = self.history.best(now_ns, self.settings["offset_ttl_minutes"] * 60 * NS_PER_S, REUSE_MAX_DELAY_MS * NS_PER_MS)
+        if record is None:
+            return False
+        wall_ns, offset_ns, _, drift, _ = record
+        self.clock.set_excursion(round((offset_ns + drift * (now_ns - wall_ns)) / NS_PER_MS), drift)
+        self.settings["time_excursion"] = self.clock.excursion_ms()
+        return True
+
     def save_settings(self):
-        with open(self.config_file, "w", encoding="utf-8") as f:
-            json.dump(self.settings, f, ensure_ascii=False, indent=2)
+        # Changes are coalesced and written once the settings stop changing
+        self.store.save(self.settings)
 
     def init_language(self):
         if self.settings["language"] == "default":
             self.lang = translation.get_local_language()
         else:
             self.lang = self.settings["language"]
-        self.translations = translation.all_translations
-        self.available_languages = [val["lang_label"] for val in self.translations.values()] # get all language labels
-        self.texts = self.translations.get(self.lang, self.translations["en"])
+        if self.lang not in translation.language_labels:
+            self.lang = "en"
+        self.available_languages = list(translation.language_labels.values())
+        self.texts = translation.get_texts(self.lang)
 
     def create_window(self, first_run):
         # Create the floating window
@@ -113,11 +410,7 @@ class FloatingClockApp():
         self.floating_window.title("Floating Clock")
         self.floating_window.overrideredirect(True)
         self.update_geometry()
-        if os.name == "nt":
-            hwnd = ctypes.windll.user32.GetParent(self.floating_window.winfo_id())
-            style = ctypes.windll.user32.GetWindowLongW(hwnd, -20)
-            ctypes.windll.user32.SetWindowLongW(hwnd, -20, style | 0x80000)
-            ctypes.windll.dwmapi.DwmSetWindowAttribute(hwnd, 2, ctypes.byref(ctypes.c_int(2)), 4)
+        make_layered(self.floating_window)
 
         # If the window was moved before, apply the position
         if self.settings["last_position"]:
@@ -133,7 +426,11 @@ class FloatingClockApp():
             bg=self.settings["bg_color"],
             fg=self.settings["text_color"]
         )
-        self.time_label.pack(fill="both", expand=True)
+        self.label_renderer = LabelRenderer(self.time_label)
+        self.renderer = self.label_renderer
+        self.time_canvas = None  # Created when the canvas renderer is first selected
+        self.canvas_renderer = None
+        self.text_metrics = TextMetricsCache(self.time_label)
 
         self.is_movable = self.settings["is_movable"]
 
@@ -159,15 +456,40 @@ class FloatingClockApp():
             font=(self.settings["font_family"], self.settings["icon_size"])
         )
 
-        self.start_x = 0
+        # Tick statistics overlay, only placed while enabled
+        self.stats_label = tk.Label(
+            self.floating_window,
+            text="",
+            bg=self.settings["bg_color"],
+            fg=self.settings["text_color"],
+            font=(self.settings["font_family"], 7),
+            justify="left"
+        )
+
+        self.start_x = 0  # Window position when the drag started
         self.start_y = 0
+        self.drag_origin = (0, 0)  # Pointer position (root coordinates) when the drag started
+        self.drag_pointer = None  # Latest pointer position not applied yet
+        self.drag_job = None
+        self.drag_moved = False  # Whether the window moved since the button was pressed
 
         self.arrange_buttons()
+        self.set_tick_stats(self.settings["show_tick_stats"])
+        self.set_renderer(self.settings["renderer"])
         self.floating_window.bind("<Button-3>", self.show_context)
         self.floating_window.bind("<Button-1>", self.drag_start)
         self.floating_window.bind("<B1-Motion>", self.drag_move)
+        self.floating_window.bind("<ButtonRelease-1>", self.drag_end)
+        self.floating_window.bind("<Map>", lambda e: self.set_visible(e, True))
+        self.floating_window.bind("<Unmap>", lambda e: self.set_visible(e, False))
+        self.floating_window.bind("<Visibility>", lambda e: self.set_visible(e, e.state != "VisibilityFullyObscured"))
+        self.floating_window.bind("<Enter>", lambda e: self.wake_from_idle())
+
+        # Additional clocks share the main clock's tick
+        self.extra_clocks = [ExtraClockWindow(self, c) for c in self.settings["clocks"]]
 
         self.update_time()
+        self.schedule_auto_sync()
         if first_run:
             self.first_run()
         self.floating_window.attributes("-topmost", True)
@@ -203,31 +525,92 @@ class FloatingClockApp():
 
     def drag_start(self, e):
         if self.is_movable:
-            self.start_x = e.x
-            self.start_y = e.y
+            self.start_x = self.floating_window.winfo_x()
+            self.start_y = self.floating_window.winfo_y()
+            self.drag_origin = (e.x_root, e.y_root)
+            self.drag_moved = False
 
     def drag_move(self, e):
-        # Move the window
+        # Remember the pointer, the window is moved once per frame
         if self.is_movable:
-            x = self.floating_window.winfo_x() + e.x - self.start_x
-            y = self.floating_window.winfo_y() + e.y - self.start_y
-            self.floating_window.geometry(f"+{x}+{y}")
-            self.settings["last_position"] = [x, y]
+            self.drag_pointer = (e.x_root, e.y_root)
+            if not self.drag_job:
+                self.drag_job = self.floating_window.after(DRAG_FRAME_MS, self.apply_drag)
+
+    def drag_end(self, e):
+        # Save the position once the window was actually moved
+        if self.drag_job:
+            self.floating_window.after_cancel(self.drag_job)
+            self.apply_drag()
+        if self.drag_moved:
+            self.drag_moved = False
+            self.save_settings()
+
+    def apply_drag(self):
+        # Move the window to follow the latest pointer position
+        self.drag_job = None
+        if self.drag_pointer is None:
+            return
+        x = self.start_x + self.drag_pointer[0] - self.drag_origin[0]
+        y = self.start_y + self.drag_pointer[1] - self.drag_origin[1]
+        self.drag_pointer = None
+        x, y = self.constrain_position(x, y)
+        self.floating_window.geometry(f"+{x}+{y}")
+        self.settings["last_position"] = [x, y]
+        self.drag_moved = True
+
+    def constrain_position(self, x, y):
+        # Snap to the screen edges and keep the window inside the screen, if enabled
+        w, h = self.settings["width"], self.settings["height"]
+        sw, sh = self.screen_width, self.screen_height
+        if self.settings["snap_to_edges"]:
+            if abs(x) < SNAP_DISTANCE:
+                x = 0
+            elif abs(sw - x - w) < SNAP_DISTANCE:
+                x = sw - w
+            if abs(y) < SNAP_DISTANCE:
+                y = 0
+            elif abs(sh - y - h) < SNAP_DISTANCE:
+                y = sh - h
+        if self.settings["keep_inside_screen"]:
+            x = max(0, min(x, sw - w))
+            y = max(0, min(y, sh - h))
+        return x, y
 
     def show_context(self, e):
         # Right click context menu
         menu = tk.Menu(self.floating_window, tearoff=0)
         menu.add_command(label=self.texts["lock"] if self.is_movable else self.texts["unlock"], command=self.toggle_lock)
         menu.add_command(label=self.texts["settings"], command=self.open_settings)
+        menu.add_command(label=self.texts["add_clock"], command=self.add_clock)
+        mode_menu = tk.Menu(menu, tearoff=0)
+        mode = self.context_mode = tk.StringVar(menu, self.settings["timer_mode"])  # Kept alive while the menu is posted
+        for name in ["clock", "stopwatch", "countdown"]:
+            mode_menu.add_radiobutton(label=self.texts["mode_" + name], value=name, variable=mode, command=lambda n=name: self.change_timer_mode(n))
+        menu.add_cascade(label=self.texts["timer_mode"], menu=mode_menu)
+        if self.settings["timer_mode"] != "clock":
+            # The command reads the counter itself, before anything else is done
+            menu.add_command(label=self.texts["timer_stop"] if self.stopwatch.running else self.texts["timer_start"], command=self.toggle_timer)
+            if self.settings["timer_mode"] == "stopwatch":
+                menu.add_command(label=self.texts["timer_lap"], command=self.timer_lap, state="normal" if self.stopwatch.running else "disabled")
+                menu.add_command(label=self.texts["export_laps"], command=self.export_laps, state="normal" if self.stopwatch.lap_count else "disabled")
+            else:
+                menu.add_command(label=self.texts["countdown_duration"], command=self.ask_countdown)
+            menu.add_command(label=self.texts["timer_reset"], command=self.reset_timer)
+        menu.add_command(label=self.texts["hide_tick_stats"] if self.tick_stats else self.texts["show_tick_stats"], command=lambda: self.show_tick_stats(not self.tick_stats))
         menu.add_command(label=self.texts["close"], command=self.quit_app)
         menu.post(e.x_root, e.y_root)
 
     def open_settings(self):
-        # Open the settings window only if it's not already open
-        if self.settings_window and tk.Toplevel.winfo_exists(self.settings_window):
-            self.settings_window.lift()
-            return
+        # Show the settings window, it is built on first use and only hidden when closed
+        if self.settings_window is None:
+            self.create_settings_window()
+        else:
+            self.refresh_settings()
+        self.settings_window.deiconify()
+        self.settings_window.lift()
 
+    def create_settings_window(self):
         self.settings_window = tk.Toplevel(self.root)
         self.settings_window.title(self.texts["settings"])
         size = self.settings.get("settings_window_size")
@@ -243,34 +626,59 @@ class FloatingClockApp():
 
         def on_configure(event):
             # Save when the size or position of the window changes
+            if event.widget is not self.settings_window:
+                return
             self.settings["settings_window_size"] = [self.settings_window.winfo_width(), self.settings_window.winfo_height()]
             self.settings["settings_window_position"] = [self.settings_window.winfo_x(), self.settings_window.winfo_y()]
             self.save_settings()
 
-        def on_close():
-            self.settings_window.destroy()
-            self.settings_window = None
-
         self.settings_window.bind("<Configure>", on_configure)
-        self.settings_window.protocol("WM_DELETE_WINDOW", on_close)
-
-        cf = ttk.Frame(self.settings_window)
-        cv = tk.Canvas(cf)
-        sb = ttk.Scrollbar(cf, orient="vertical", command=cv.yview)
-        frm = ttk.Frame(cv)
-        frm.bind("<Configure>", lambda e: cv.configure(scrollregion=cv.bbox("all")))
-        cv.create_window((0, 0), window=frm, anchor="nw")
-        cv.configure(yscrollcommand=sb.set)
-        cf.pack(fill="both", expand=True)
-        cv.pack(side="left", fill="both", expand=True)
-        sb.pack(side="right", fill="y")
-
-        # Disable mouse wheel scrolling
-        def disable_mousewheel(wid):
-            wid.bind("<MouseWheel>", lambda e: "break")
-        for widget in [cf, cv, sb, frm]:
-            disable_mousewheel(widget)
-
+        self.settings_window.protocol("WM_DELETE_WINDOW", self.settings_window.withdraw)
+
+        # Each section is a notebook tab, built the first time it is shown
+        self.settings_sections = {
+            "appearance": (self.build_appearance_section, self.refresh_appearance_section),
+            "window": (self.build_window_section, self.refresh_window_section),
+            "time": (self.build_time_section, self.refresh_time_section),
+            "about": (self.build_about_section, None),
+        }
+        self.built_sections = set()
+        self.section_frames = {}
+        nb = ttk.Notebook(self.settings_window)
+        nb.pack(fill="both", expand=True)
+        nb.bind("<<NotebookTabChanged>>", lambda e: self.show_section(nb.select()))
+        for name in self.settings_sections:
+            frm = ttk.Frame(nb)
+            self.section_frames[str(frm)] = name
+            nb.add(frm, text=self.texts["section_" + name])
+        self.show_section(nb.select())
+
+    def show_section(self, tab):
+        # Build a section the first time its tab is selected
+        name = self.section_frames[tab]
+        if name in self.built_sections:
+            return
+        build, refresh = self.settings_sections[name]
+        build(self.settings_window.nametowidget(tab))
+        self.built_sections.add(name)
+        if refresh:
+            refresh()
+
+    def refresh_settings(self):
+        # Load the current settings into the widgets of the built sections
+        for name in self.built_sections:
+            refresh = self.settings_sections[name][1]
+            if refresh:
+                refresh()
+
+    def section_shown(self, name):
+        return self.settings_window is not None and name in self.built_sections
+
+    def set_entry(self, entry, v):
+        entry.delete(0, tk.END)
+        entry.insert(0, str(v))
+
+    def build_appearance_section(self, frm):
         r = 0 # row number, used for grid layout
         ttk.Label(frm, text=self.texts["bg_color"]).grid(row=r, column=0, padx=10, pady=5, sticky="w")
         ttk.Button(frm, text=self.texts["choose_color"], command=self.pick_bg_color).grid(row=r, column=1, padx=10, pady=5, sticky="w")
@@ -288,56 +696,45 @@ class FloatingClockApp():
             alpha_frame,
             from_=0.05,
             to=1.0,
-            value=self.settings["bg_opacity"],
             orient="horizontal",
             length=120,
-            command=self.alpha_scale_changed
         )
         self.alpha_scale.pack(side="left")
 
         self.alpha_entry = ttk.Entry(alpha_frame, width=5)
-        self.alpha_entry.insert(0, str(self.settings["bg_opacity"]))
         self.alpha_entry.pack(side="left", padx=5)
         self.alpha_entry.bind("<FocusOut>", lambda e: self.alpha_entry_apply())
         self.alpha_entry.bind("<Return>", lambda e: self.alpha_entry_apply())
         r += 1
 
-        chk_u = tk.BooleanVar(value=self.settings["show_buttons_when_unlocked"])
-        ttk.Label(frm, text=self.texts["show_buttons_when_unlocked"]).grid(row=r, column=0, padx=10, pady=5, sticky="w")
-        ttk.Checkbutton(frm, variable=chk_u, command=lambda: self.show_button_unlocked(chk_u.get())).grid(row=r, column=1, padx=10, pady=5, sticky="w")
-        r += 1
-
-        chkl = tk.BooleanVar(value=self.settings["show_buttons_when_locked"])
-        ttk.Label(frm, text=self.texts["show_buttons_when_locked"]).grid(row=r, column=0, padx=10, pady=5, sticky="w")
-        ttk.Checkbutton(frm, variable=chkl, command=lambda: self.show_button_locked(chkl.get())).grid(row=r, column=1, padx=10, pady=5, sticky="w")
-        r += 1
-
-        autostart = tk.BooleanVar(value=self.check_autostart())
-        ttk.Label(frm, text=self.texts["auto_start"]).grid(row=r, column=0, padx=10, pady=5, sticky="w")
-        ttk.Checkbutton(frm, variable=autostart, command=lambda: self.set_autostart(autostart.get())).grid(row=r, column=1, padx=10, pady=5, sticky="w")
+        ttk.Label(frm, text=self.texts["font_label"]).grid(row=r, column=0, padx=10, pady=5, sticky="w")
+        font_frame = ttk.Frame(frm)
+        font_frame.grid(row=r, column=1, padx=10, pady=5, sticky="w")
+        self.combo_font = ttk.Combobox(font_frame, state="readonly")
+        self.combo_font.pack(side="left")
+        ttk.Button(font_frame, text=self.texts["refresh_fonts"], command=self.refresh_fonts).pack(side="left", padx=5)
+        self.combo_font.bind("<MouseWheel>", self.font_mouse_wheel) # enable mouse wheel scrolling
+        self.combo_font.bind("<<ComboboxSelected>>", lambda e: self.change_font(self.combo_font.get()))
         r += 1
 
-        ttk.Label(frm, text=self.texts["lang_switch"]).grid(row=r, column=0, padx=10, pady=5, sticky="w")
-        combo_lang = ttk.Combobox(frm, values=self.available_languages, state="readonly")
-        combo_lang.set(self.translations[self.lang]["lang_label"])
-        combo_lang.grid(row=r, column=1, padx=10, pady=5, sticky="w")
-        combo_lang.bind("<MouseWheel>", lambda e: "break") # disable mouse wheel scrolling
-        combo_lang.bind("<<ComboboxSelected>>", lambda e: self.switch_lang_by_label(combo_lang.get()))
+        self.renderer_texts = [self.texts["renderer_label"], self.texts["renderer_canvas"]]
+        ttk.Label(frm, text=self.texts["renderer"]).grid(row=r, column=0, padx=10, pady=5, sticky="w")
+        self.combo_renderer = ttk.Combobox(frm, values=self.renderer_texts, state="readonly")
+        self.combo_renderer.bind("<MouseWheel>", lambda e: "break")
+        self.combo_renderer.grid(row=r, column=1, padx=10, pady=5, sticky="w")
+        self.combo_renderer.bind("<<ComboboxSelected>>", lambda e: self.change_renderer_by_text(self.combo_renderer.get()))
         r += 1
 
-        ttk.Label(frm, text=self.texts["font_label"]).grid(row=r, column=0, padx=10, pady=5, sticky="w")
-        combo_font = ttk.Combobox(frm, values=sorted(families()), state="readonly")
-        combo_font.set(self.settings["font_family"])
-        combo_font.grid(row=r, column=1, padx=10, pady=5, sticky="w")
-        combo_font.bind("<MouseWheel>", self.font_mouse_wheel) # enable mouse wheel scrolling
-        combo_font.bind("<<ComboboxSelected>>", lambda e: self.change_font(combo_font.get()))
+        self.var_monospace = tk.BooleanVar()
+        ttk.Label(frm, text=self.texts["monospace_only"]).grid(row=r, column=0, padx=10, pady=5, sticky="w")
+        ttk.Checkbutton(frm, variable=self.var_monospace, command=lambda: self.set_monospace_only(self.var_monospace.get())).grid(row=r, column=1, padx=10, pady=5, sticky="w")
         r += 1
 
         ttk.Label(frm, text=self.texts["time_font_size"]).grid(row=r, column=0, padx=10, pady=5, sticky="w")
         ftf = ttk.Frame(frm)
         ftf.grid(row=r, column=1, padx=10, pady=5, sticky="w")
         ttk.Button(ftf, text="-1", command=lambda: self.edit_time_font(-1)).pack(side="left")
-        self.lbl_time_font = ttk.Label(ftf, text=str(self.settings["time_font_size"]))
+        self.lbl_time_font = ttk.Label(ftf)
         self.lbl_time_font.pack(side="left")
         ttk.Button(ftf, text="+1", command=lambda: self.edit_time_font(1)).pack(side="left")
         r += 1
@@ -346,18 +743,33 @@ class FloatingClockApp():
         fic = ttk.Frame(frm)
         fic.grid(row=r, column=1, padx=10, pady=5, sticky="w")
         ttk.Button(fic, text="-1", command=lambda: self.edit_icon_size(-1)).pack(side="left")
-        self.lbl_icon_font = ttk.Label(fic, text=str(self.settings["icon_size"]))
+        self.lbl_icon_font = ttk.Label(fic)
         self.lbl_icon_font.pack(side="left")
         ttk.Button(fic, text="+1", command=lambda: self.edit_icon_size(1)).pack(side="left")
         r += 1
 
-        pcv = [self.texts["seconds"], "100" + self.texts["milliseconds"], "10" + self.texts["milliseconds"], self.texts["milliseconds"]]
-        ttk.Label(frm, text=self.texts["precision"]).grid(row=r, column=0, padx=10, pady=5, sticky="w")
-        combo_tp = ttk.Combobox(frm, values=pcv, state="readonly")
-        combo_tp.bind("<MouseWheel>", lambda e: "break")
-        combo_tp.set(pcv[int(self.settings["time_precision_digits"])])
-        combo_tp.grid(row=r, column=1, padx=10, pady=5, sticky="w")
-        combo_tp.bind("<<ComboboxSelected>>", lambda e: self.change_precision_by_text(combo_tp.get()))
+    def refresh_appearance_section(self):
+        self.alpha_scale.config(command="")  # Don't write the value back while loading it
+        self.alpha_scale.set(self.settings["bg_opacity"])
+        self.alpha_scale.config(command=self.alpha_scale_changed)
+        self.set_entry(self.alpha_entry, self.settings["bg_opacity"])
+        self.combo_font.config(values=self.font_catalog.families(self.settings["monospace_fonts_only"]))
+        self.combo_font.set(self.settings["font_family"])
+        self.var_monospace.set(self.settings["monospace_fonts_only"])
+        self.combo_renderer.set(self.renderer_texts[self.settings["renderer"] == "canvas"])
+        self.lbl_time_font.config(text=str(self.settings["time_font_size"]))
+        self.lbl_icon_font.config(text=str(self.settings["icon_size"]))
+
+    def build_window_section(self, frm):
+        r = 0
+        self.var_buttons_unlocked = tk.BooleanVar()
+        ttk.Label(frm, text=self.texts["show_buttons_when_unlocked"]).grid(row=r, column=0, padx=10, pady=5, sticky="w")
+        ttk.Checkbutton(frm, variable=self.var_buttons_unlocked, command=lambda: self.show_button_unlocked(self.var_buttons_unlocked.get())).grid(row=r, column=1, padx=10, pady=5, sticky="w")
+        r += 1
+
+        self.var_buttons_locked = tk.BooleanVar()
+        ttk.Label(frm, text=self.texts["show_buttons_when_locked"]).grid(row=r, column=0, padx=10, pady=5, sticky="w")
+        ttk.Checkbutton(frm, variable=self.var_buttons_locked, command=lambda: self.show_button_locked(self.var_buttons_locked.get())).grid(row=r, column=1, padx=10, pady=5, sticky="w")
         r += 1
 
         ttk.Label(frm, text=self.texts["width"]).grid(row=r, column=0, padx=10, pady=5, sticky="w")
@@ -366,7 +778,6 @@ class FloatingClockApp():
         width_frame.grid(row=r, column=1, padx=10, pady=5, sticky="w")
         ttk.Button(width_frame, text="-10", command=lambda: self.edit_width(-10), width=4).pack(side="left")
         ttk.Button(width_frame, text="-1", command=lambda: self.edit_width(-1), width=4).pack(side="left")
-        self.width_entry.insert(0, str(self.settings["width"]))
         self.width_entry.pack(side="left", padx=5)
         ttk.Button(width_frame, text="+1", command=lambda: self.edit_width(1), width=4).pack(side="left")
         ttk.Button(width_frame, text="+10", command=lambda: self.edit_width(10), width=4).pack(side="left")
@@ -379,18 +790,58 @@ class FloatingClockApp():
         height_frame.grid(row=r, column=1, padx=10, pady=5, sticky="w")
         ttk.Button(height_frame, text="-10", command=lambda: self.edit_height(-10), width=4).pack(side="left")
         ttk.Button(height_frame, text="-1", command=lambda: self.edit_height(-1), width=4).pack(side="left")
-        self.height_entry.insert(0, str(self.settings["height"]))
         self.height_entry.pack(side="left", padx=5)
         ttk.Button(height_frame, text="+1", command=lambda: self.edit_height(1), width=4).pack(side="left")
         ttk.Button(height_frame, text="+10", command=lambda: self.edit_height(10), width=4).pack(side="left")
         self.height_entry.bind("<KeyRelease>", lambda e: self.change_height(self.height_entry.get()))
         r += 1
 
+        self.var_snap = tk.BooleanVar()
+        ttk.Label(frm, text=self.texts["snap_to_edges"]).grid(row=r, column=0, padx=10, pady=5, sticky="w")
+        ttk.Checkbutton(frm, variable=self.var_snap, command=lambda: self.set_drag_option("snap_to_edges", self.var_snap.get())).grid(row=r, column=1, padx=10, pady=5, sticky="w")
+        r += 1
+
+        self.var_keep_inside = tk.BooleanVar()
+        ttk.Label(frm, text=self.texts["keep_inside_screen"]).grid(row=r, column=0, padx=10, pady=5, sticky="w")
+        ttk.Checkbutton(frm, variable=self.var_keep_inside, command=lambda: self.set_drag_option("keep_inside_screen", self.var_keep_inside.get())).grid(row=r, column=1, padx=10, pady=5, sticky="w")
+        r += 1
+
+        self.var_autostart = tk.BooleanVar()
+        ttk.Label(frm, text=self.texts["auto_start"]).grid(row=r, column=0, padx=10, pady=5, sticky="w")
+        ttk.Checkbutton(frm, variable=self.var_autostart, command=lambda: self.set_autostart(self.var_autostart.get())).grid(row=r, column=1, padx=10, pady=5, sticky="w")
+        r += 1
+
+        ttk.Label(frm, text=self.texts["lang_switch"]).grid(row=r, column=0, padx=10, pady=5, sticky="w")
+        combo_lang = ttk.Combobox(frm, values=self.available_languages, state="readonly")
+        combo_lang.set(translation.language_labels[self.lang])
+        combo_lang.grid(row=r, column=1, padx=10, pady=5, sticky="w")
+        combo_lang.bind("<MouseWheel>", lambda e: "break") # disable mouse wheel scrolling
+        combo_lang.bind("<<ComboboxSelected>>", lambda e: self.switch_lang_by_label(combo_lang.get()))
+        r += 1
+
+    def refresh_window_section(self):
+        self.var_buttons_unlocked.set(self.settings["show_buttons_when_unlocked"])
+        self.var_buttons_locked.set(self.settings["show_buttons_when_locked"])
+        self.set_entry(self.width_entry, self.settings["width"])
+        self.set_entry(self.height_entry, self.settings["height"])
+        self.var_snap.set(self.settings["snap_to_edges"])
+        self.var_keep_inside.set(self.settings["keep_inside_screen"])
+        self.var_autostart.set(self.check_autostart())
+
+    def build_time_section(self, frm):
+        r = 0
+        self.precision_texts = [self.texts["seconds"], "100" + self.texts["milliseconds"], "10" + self.texts["milliseconds"], self.texts["milliseconds"]]
+        ttk.Label(frm, text=self.texts["precision"]).grid(row=r, column=0, padx=10, pady=5, sticky="w")
+        self.combo_tp = ttk.Combobox(frm, values=self.precision_texts, state="readonly")
+        self.combo_tp.bind("<MouseWheel>", lambda e: "break")
+        self.combo_tp.grid(row=r, column=1, padx=10, pady=5, sticky="w")
+        self.combo_tp.bind("<<ComboboxSelected>>", lambda e: self.change_precision_by_text(self.combo_tp.get()))
+        r += 1
+
         ttk.Label(frm, text=self.texts["sync_interval"]).grid(row=r, column=0, padx=10, pady=5, sticky="w")
         sync_frame = ttk.Frame(frm)
         self.sync_entry = ttk.Entry(sync_frame, width=10)
         sync_frame.grid(row=r, column=1, padx=10, pady=5, sticky="w")
-        self.sync_entry.insert(0, str(self.settings["sync_interval"]))
         self.sync_entry.pack(side="left", padx=5)
         self.sync_entry.bind("<KeyRelease>", lambda e: self.change_sync_interval(self.sync_entry.get()))
         r += 1
@@ -399,46 +850,70 @@ class FloatingClockApp():
         time_excursion_frame = ttk.Frame(frm)
         self.time_excursion_entry = ttk.Entry(time_excursion_frame, width=10)
         time_excursion_frame.grid(row=r, column=1, padx=10, pady=5, sticky="w")
-        self.time_excursion_entry.insert(0, str(self.settings["time_excursion"]))
         self.time_excursion_entry.pack(side="left", padx=5)
-        ttk.Button(time_excursion_frame, text=self.texts["online_sync"], command=lambda: self.update_time(online=True)).pack(side="left")
+        self.sync_button = ttk.Button(time_excursion_frame, command=self.online_sync)
+        self.sync_button.pack(side="left")
         self.time_excursion_entry.bind("<KeyRelease>", lambda e: self.change_time_excursion(self.time_excursion_entry.get()))
         r += 1
 
+        self.sync_status_label = ttk.Label(frm, text="")
+        self.sync_status_label.grid(row=r, column=1, padx=10, sticky="w")
+        r += 1
+
+        ttk.Label(frm, text=self.texts["auto_sync_interval"]).grid(row=r, column=0, padx=10, pady=5, sticky="w")
+        self.auto_sync_entry = ttk.Entry(frm, width=10)
+        self.auto_sync_entry.grid(row=r, column=1, padx=15, pady=5, sticky="w")
+        self.auto_sync_entry.bind("<KeyRelease>", lambda e: self.change_auto_sync(self.auto_sync_entry.get()))
+        r += 1
+
+    def refresh_time_section(self):
+        self.combo_tp.set(self.precision_texts[int(self.settings["time_precision_digits"])])
+        self.set_entry(self.sync_entry, self.settings["sync_interval"])
+        self.set_entry(self.time_excursion_entry, self.settings["time_excursion"])
+        self.set_entry(self.auto_sync_entry, self.settings["auto_sync_minutes"])
+        self.sync_status_label.config(text=self.sync_status[0])
+        self.sync_button.config(text=self.sync_status[1])
+
+    def build_about_section(self, frm):
+        r = 0
         ttk.Button(frm, text=self.texts["restore_default"], command=self.restore_default).grid(row=r, column=0, columnspan=2, padx=10, pady=5, sticky="ew")
         r += 1
 
-        ttk.Button(frm, text=self.texts["project_link"], command=lambda: webbrowser.open('https://github.com/liaoyanqing666/Time_Floating_Window')).grid(row=r, column=0, columnspan=2, padx=10, pady=5, sticky="ew")
+        ttk.Button(frm, text=self.texts["project_link"], command=lambda: self.open_link('https://github.com/liaoyanqing666/Time_Floating_Window')).grid(row=r, column=0, columnspan=2, padx=10, pady=5, sticky="ew")
         r += 1
 
-        ttk.Button(frm, text=self.texts["author"], command=lambda: webbrowser.open('https://github.com/liaoyanqing666')).grid(row=r, column=0, columnspan=2, padx=10, pady=5, sticky="ew")
+        ttk.Button(frm, text=self.texts["author"], command=lambda: self.open_link('https://github.com/liaoyanqing666')).grid(row=r, column=0, columnspan=2, padx=10, pady=5, sticky="ew")
         r += 1
+        frm.columnconfigure(0, weight=1)
 
     def font_mouse_wheel(self, e):
         # Enable mouse wheel scrolling for the font combobox
         self.inc_font() if e.delta > 0 else self.dec_font()
+        self.combo_font.set(self.settings["font_family"])
+        return "break"
 
     def inc_font(self):
-        # Get the font families and change to the next one
-        fonts = sorted(families())
-        current = self.settings["font_family"]
-        try:
-            idx = fonts.index(current)
-        except ValueError:
-            idx = 0
-        if idx < len(fonts) - 1:
-            self.change_font(fonts[idx + 1])
+        # Change to the next font family
+        f = self.font_catalog.neighbour(self.settings["font_family"], 1, self.settings["monospace_fonts_only"])
+        if f:
+            self.change_font(f)
 
     def dec_font(self):
-        # Get the font families and change to the previous one
-        fonts = sorted(families())
-        current = self.settings["font_family"]
-        try:
-            idx = fonts.index(current)
-        except ValueError:
-            idx = 0
-        if idx > 0:
-            self.change_font(fonts[idx - 1])
+        # Change to the previous font family
+        f = self.font_catalog.neighbour(self.settings["font_family"], -1, self.settings["monospace_fonts_only"])
+        if f:
+            self.change_font(f)
+
+    def refresh_fonts(self):
+        # Read the font families again, e.g. after fonts were installed while the clock runs
+        self.font_catalog.refresh()
+        self.combo_font.config(values=self.font_catalog.families(self.settings["monospace_fonts_only"]))
+
+    def set_monospace_only(self, v):
+        # Limit the font list to monospace families
+        self.settings["monospace_fonts_only"] = v
+        self.combo_font.config(values=self.font_catalog.families(v))
+        self.save_settings()
 
     def alpha_scale_changed(self, v):
         # When the value of the scale widget changes
@@ -447,6 +922,7 @@ class FloatingClockApp():
             f = round(f, 2)
             self.settings["bg_opacity"] = f
             self.floating_window.attributes("-alpha", f)
+            self.update_extra_clocks()
             self.alpha_entry.delete(0, tk.END)
             self.alpha_entry.insert(0, str(f))
             self.save_settings()
@@ -461,6 +937,7 @@ class FloatingClockApp():
             f = round(f, 2)
             self.settings["bg_opacity"] = f
             self.floating_window.attributes("-alpha", f)
+            self.update_extra_clocks()
             self.alpha_scale.set(f)
             self.alpha_entry.delete(0, tk.END)
             self.alpha_entry.insert(0, str(f))
@@ -470,16 +947,26 @@ class FloatingClockApp():
             self.alpha_entry.delete(0, tk.END)
             self.alpha_entry.insert(0, str(self.settings["bg_opacity"]))
 
+    def open_link(self, url):
+        import webbrowser
+        webbrowser.open(url)
+
     def restore_default(self):
         # When the user clicks the Restore Default Settings button, confirm and restore
         if messagebox.askyesno(self.texts["confirm"], self.texts["restore_confirm"]):
             if os.path.exists(self.config_file):
                 os.remove(self.config_file)
             self.load_settings()
+            self.clock.set_excursion(self.settings["time_excursion"])  # quit_app saves the clock's excursion
+            self.history.clear()  # Otherwise the next start restores the synced offset
             self.save_settings()
             messagebox.showinfo(self.texts["info"], self.texts["restore_done"])
             self.quit_app()
 
+    def set_drag_option(self, key, v):
+        self.settings[key] = v
+        self.save_settings()
+
     def show_button_locked(self, v):
         self.settings["show_buttons_when_locked"] = v
         self.arrange_buttons()
@@ -492,35 +979,74 @@ class FloatingClockApp():
 
     def pick_bg_color(self):
         # Open the color chooser dialog and set the background color
+        from tkinter import colorchooser
         c = colorchooser.askcolor()[1]
         if c:
             self.settings["bg_color"] = c
-            for widget in [self.floating_window, self.time_label, self.pin_button, self.close_button]:
-                widget.config(bg=c)
+            self.apply_colors()
             self.save_settings()
 
     def pick_text_color(self):
         # Open the color chooser dialog and set the text color
+        from tkinter import colorchooser
         c = colorchooser.askcolor()[1]
         if c:
             self.settings["text_color"] = c
-            for widget in [self.time_label, self.pin_button, self.close_button]:
-                widget.config(fg=c)
+            self.apply_colors()
             self.save_settings()
 
+    def apply_colors(self):
+        # Apply the background and text colors to the floating windows
+        self.floating_window.config(bg=self.settings["bg_color"])
+        for widget in [self.pin_button, self.close_button, self.stats_label]:
+            widget.config(bg=self.settings["bg_color"], fg=self.settings["text_color"])
+        self.update_time_style()
+        self.update_extra_clocks()
+
     def change_font(self, f):
         # Change the font family
         self.settings["font_family"] = f
-        self.time_label.config(font=(f, self.settings["time_font_size"]))
+        self.update_time_style()
         self.pin_button.config(font=(f, self.settings["icon_size"]))
         self.close_button.config(font=(f, self.settings["icon_size"]))
+        self.update_extra_clocks()
         self.save_settings()
         self.check_size_for_font_change()
 
+    def update_time_style(self):
+        # Apply the time font and colors to the active renderer
+        self.renderer.set_style((self.settings["font_family"], self.settings["time_font_size"]), self.settings["bg_color"], self.settings["text_color"])
+
+    def set_renderer(self, name):
+        # Show the time with a tk.Label, or with a canvas that only redraws the characters that changed
+        self.settings["renderer"] = name
+        self.time_label.pack_forget()
+        if self.time_canvas:
+            self.time_canvas.pack_forget()
+        if name == "canvas":
+            if self.time_canvas is None:
+                self.time_canvas = tk.Canvas(self.floating_window, highlightthickness=0, bd=0)
+                self.canvas_renderer = CanvasRenderer(self.time_canvas)
+            self.time_canvas.pack(fill="both", expand=True)
+            self.renderer = self.canvas_renderer
+        else:
+            self.time_label.pack(fill="both", expand=True)
+            self.renderer = self.label_renderer
+        for widget in [self.pin_button, self.close_button, self.stats_label]:
+            widget.lift()
+        self.update_time_style()
+        self.renderer.invalidate()
+        if self.tick_job:
+            self.update_time()
+
+    def change_renderer_by_text(self, txt):
+        self.set_renderer("canvas" if txt == self.texts["renderer_canvas"] else "label")
+        self.save_settings()
+
     def check_size_for_font_change(self):
         # Check if the window size is enough for the new font size
         w, h = self.settings["width"], self.settings["height"]
-        lw, lh = self.min_label_w(), self.min_label_h()
+        lw, lh = self.min_label_size()
         resized = False
         if w < lw:
             self.settings["width"] = lw
@@ -548,15 +1074,17 @@ class FloatingClockApp():
     def set_precision(self, p):
         # Set the time precision and adjust the window size if necessary
         self.settings["time_precision_digits"] = p
-        if self.settings["width"] < self.min_label_w():
-            self.settings["width"] = self.min_label_w()
+        lw = self.min_label_size()[0]
+        if self.settings["width"] < lw:
+            self.settings["width"] = lw
             self.update_geometry()
         self.save_settings()
+        self.update_time()
 
     def change_width(self, v):
         # Change the width of the window
         if v.isdigit():
-            w = max(int(v), self.min_label_w())
+            w = max(int(v), self.min_label_size()[0])
             self.settings["width"] = min(w, self.settings["max_width"])
             self.update_geometry()
             self.save_settings()
@@ -564,7 +1092,7 @@ class FloatingClockApp():
     def change_height(self, v):
         # Change the height of the window
         if v.isdigit():
-            h = max(int(v), self.min_label_h())
+            h = max(int(v), self.min_label_size()[1])
             self.settings["height"] = min(h, self.settings["max_height"])
             self.update_geometry()
             self.save_settings()
@@ -576,8 +1104,9 @@ class FloatingClockApp():
         except ValueError:
             current = self.settings["width"]
         new_width = current + n
-        if new_width < self.min_label_w():
-            new_width = self.min_label_w()
+        lw = self.min_label_size()[0]
+        if new_width < lw:
+            new_width = lw
         elif new_width > self.settings["max_width"]:
             new_width = self.settings["max_width"]
         self.width_entry.delete(0, tk.END)
@@ -591,8 +1120,9 @@ class FloatingClockApp():
         except ValueError:
             current = self.settings["height"]
         new_height = current + n
-        if new_height < self.min_label_h():
-            new_height = self.min_label_h()
+        lh = self.min_label_size()[1]
+        if new_height < lh:
+            new_height = lh
         elif new_height > self.settings["max_height"]:
             new_height = self.settings["max_height"]
         self.height_entry.delete(0, tk.END)
@@ -607,7 +1137,8 @@ class FloatingClockApp():
         elif self.settings["time_font_size"] > 72:
             self.settings["time_font_size"] = 72
         self.lbl_time_font.config(text=str(self.settings["time_font_size"]))
-        self.time_label.config(font=(self.settings["font_family"], self.settings["time_font_size"]))
+        self.update_time_style()
+        self.update_extra_clocks()
         self.save_settings()
         self.check_size_for_font_change()
 
@@ -628,6 +1159,7 @@ class FloatingClockApp():
             i = int(v)
             self.settings["sync_interval"] = max(1, i)
             self.save_settings()
+            self.update_time()
         except ValueError:
             pass
 
@@ -636,7 +1168,19 @@ class FloatingClockApp():
         try:
             i = int(v)
             self.settings["time_excursion"] = i
+            self.clock.set_excursion(i)
+            self.history.clear()  # A manual excursion replaces the synced ones
+            self.save_settings()
+        except ValueError:
+            pass
+
+    def change_auto_sync(self, v):
+        # Change the automatic resync interval (minutes, 0 = off)
+        try:
+            i = int(v)
+            self.settings["auto_sync_minutes"] = max(0, i)
             self.save_settings()
+            self.schedule_auto_sync()
         except ValueError:
             pass
 
@@ -645,25 +1189,9 @@ class FloatingClockApp():
         for button in [self.pin_button, self.close_button]:
             button.config(font=(self.settings["font_family"], self.settings["icon_size"]))
 
-    def min_label_w(self):
-        # Get the minimum width of the time label to ensure the text fits
-        original_text = self.time_label.cget("text")
-        test_text = "89:88:88" + ("." if self.settings["time_precision_digits"] > 0 else "") + "8" * int(self.settings["time_precision_digits"])
-        self.time_label.config(text=test_text)
-        self.floating_window.update_idletasks()
-        lw = self.time_label.winfo_reqwidth()
-        self.time_label.config(text=original_text)
-        return lw
-
-    def min_label_h(self):
-        # Get the minimum height of the time label to ensure the text fits
-        original_text = self.time_label.cget("text")
-        test_text = "89:88:88" + ("." if self.settings["time_precision_digits"] > 0 else "") + "8" * int(self.settings["time_precision_digits"])
-        self.time_label.config(text=test_text)
-        self.floating_window.update_idletasks()
-        lh = self.time_label.winfo_reqheight()
-        self.time_label.config(text=original_text)
-        return lh
+    def min_label_size(self):
+        # Get the minimum (width, height) of the time label to ensure the text fits
+        return self.text_metrics.label_size(self.settings["font_family"], self.settings["time_font_size"], int(self.settings["time_precision_digits"]))
 
     def apply_position_or_center(self):
         # Apply the position if it is valid, otherwise center the window
@@ -677,7 +1205,7 @@ class FloatingClockApp():
     def center_window(self):
         # Center the window on the screen
         w, h = self.settings["width"], self.settings["height"]
-        sw, sh = self.floating_window.winfo_screenwidth(), self.floating_window.winfo_screenheight()
+        sw, sh = self.screen_width, self.screen_height
         x, y = (sw - w) // 2, (sh - h) // 2
         self.floating_window.geometry(f'{w}x{h}+{x}+{y}')
 
@@ -689,52 +1217,313 @@ class FloatingClockApp():
             self.floating_window.geometry(f'{w}x{h}+{x}+{y}')
         else:
             self.center_window()
+        self.update_extra_clocks()
 
     def center_in_screen(self, x, y, w, h):
         # Check if the window is within the screen boundaries
         cx, cy = x + w / 2, y + h / 2
-        sw, sh = self.floating_window.winfo_screenwidth(), self.floating_window.winfo_screenheight()
+        sw, sh = self.screen_width, self.screen_height
         return 0 <= cx <= sw and 0 <= cy <= sh
 
-    def update_time(self, online=False):
-        # Update the time label
-        if online:
-            try:
-                c = ntplib.NTPClient()
-                response = c.request('pool.ntp.org')
-                network_time = datetime.fromtimestamp(response.tx_time)
-                now = datetime.now()
-                # # with delay
-                # round_trip_delay = response.delay
-                # self.settings["time_excursion"] = int(((now - network_time).total_seconds() + round_trip_delay/2) * 1000)
-                # without delay
-                self.settings["time_excursion"] = int((now - network_time).total_seconds() * 1000)
-                self.time_excursion_entry.delete(0, tk.END)
-                self.time_excursion_entry.insert(0, str(self.settings["time_excursion"]))
-                self.save_settings()
-            except Exception as e:
-                print(e)
-        now = datetime.now()
-        now += timedelta(milliseconds=self.settings["time_excursion"])
-        if int(self.settings["time_precision_digits"]) > 0:
-            formatted_time = now.strftime("%H:%M:%S.%f")[: -6 + int(self.settings["time_precision_digits"])]
+    def update_time(self):
+        # Update the time label immediately and restart the tick schedule, the lateness learned so far is kept
+        if self.tick_job:
+            self.floating_window.after_cancel(self.tick_job)
+        self.clock.reset_schedule()
+        self.timer_due_ns = None
+        self.tick()
+
+    def tick(self):
+        # Render the current time and arm the next tick at the next visible change
+        if self.tick_stats:
+            start = perf_counter_ns()
+        digits = int(self.settings["time_precision_digits"])
+        if self.settings["timer_mode"] == "clock":
+            text, delay_ns = self.clock.tick(digits, self.tick_interval(), [extra.offset_ns for extra in self.extra_clocks])
+            now_ns = self.clock.last_now_ns
+            lateness = self.clock.last_lateness
         else:
-            formatted_time = now.strftime("%H:%M:%S")
-        self.time_label.config(text=formatted_time)
-        self.floating_window.after(self.settings["sync_interval"], self.update_time)
+            # Elapsed time is read from the counter at render time, so late ticks never skew it
+            woke_ns = perf_counter_ns()
+            lateness = None if self.timer_due_ns is None else woke_ns - self.timer_due_ns
+            interval = self.tick_interval()
+            text, delay_ns = self.stopwatch.tick(digits, interval)
+            now_ns = 0
+            if self.extra_clocks:
+                # Also wake at the additional clocks' boundaries, the timer's are unrelated to them
+                now_ns = self.clock.now_ns()
+                offsets = [extra.offset_ns for extra in self.extra_clocks]
+                delay_ns = min(delay_ns, next_boundary_ns(now_ns, tick_step_ns(digits, interval), offsets) - now_ns)
+            self.timer_due_ns = woke_ns + delay_ns
+            if self.stopwatch.expired:
+                self.stopwatch.expired = False
+                self.floating_window.bell()
+        self.renderer.render(text)
+        for extra in self.extra_clocks:
+            extra.render(now_ns, digits)
+        if self.tick_stats and lateness is not None:
+            self.tick_stats.record(start, lateness, perf_counter_ns() - start)
+        self.tick_job = self.floating_window.after(max(1, -(-delay_ns // NS_PER_MS)), self.tick)
+
+    def tick_interval(self):
+        # sync_interval, slowed down while all clocks are hidden or the user is idle
+        interval = self.settings["sync_interval"]
+        if not self.visible and not any(extra.visible for extra in self.extra_clocks):
+            return max(interval, HIDDEN_INTERVAL_MS)
+        if self.settings["idle_throttle_minutes"] > 0:
+            now = time.monotonic()
+            if now >= self.next_idle_check:
+                self.next_idle_check = now + 1
+                self.user_idle = user_idle_ms() >= self.settings["idle_throttle_minutes"] * 60000
+            if self.user_idle:
+                return max(interval, IDLE_INTERVAL_MS)
+        return interval
+
+    def set_visible(self, e, visible):
+        # Tick slowly while the clock cannot be seen, and repaint at once when it reappears
+        if e.widget is not self.floating_window or visible == self.visible:
+            return
+        self.visible = visible
+        if visible:
+            self.update_time()
+
+    def wake_from_idle(self):
+        # The pointer is over the clock, go back to full rate without waiting for the idle check
+        if self.user_idle:
+            self.user_idle = False
+            self.next_idle_check = time.monotonic() + 1
+            self.update_time()
+
+    def set_timer_mode(self, mode):
+        # Show the time of day, a stopwatch or a countdown of countdown_seconds, starting from zero
+        self.settings["timer_mode"] = mode
+        self.stopwatch.reset()
+        self.stopwatch.countdown_ns = int(self.settings["countdown_seconds"] * NS_PER_S) if mode == "countdown" else 0
+
+    def change_timer_mode(self, mode):
+        self.set_timer_mode(mode)
+        self.save_settings()
+        self.update_time()
+
+    def toggle_timer(self):
+        self.stopwatch.toggle()
+        self.update_time()
+
+    def timer_lap(self):
+        self.stopwatch.lap()
+
+    def reset_timer(self):
+        self.stopwatch.reset()
+        self.update_time()
+
+    def ask_countdown(self):
+        # Ask for a new countdown duration in seconds and restart the countdown with it
+        from tkinter import simpledialog
+        seconds = simpledialog.askinteger(self.texts["countdown_duration"], self.texts["countdown_prompt"], initialvalue=self.settings["countdown_seconds"], minvalue=1, parent=self.floating_window)
+        if seconds:
+            self.settings["countdown_seconds"] = seconds
+            self.change_timer_mode("countdown")
+
+    def export_laps(self):
+        # Save the recorded laps as CSV
+        from tkinter import filedialog
+        path = filedialog.asksaveasfilename(parent=self.floating_window, defaultextension=".csv", filetypes=[("CSV", "*.csv")], initialfile="laps.csv")
+        if not path:
+            return
+        try:
+            self.stopwatch.export_csv(path, int(self.settings["time_precision_digits"]))
+        except OSError as e:
+            messagebox.showerror(self.texts["error"], str(e))
+
+    def add_clock(self):
+        # Add a UTC clock below the existing ones and open its form to pick the label, time zone, offsets and colors
+        config = {"label": "UTC", "timezone": "UTC", "utc_offset_minutes": 0, "time_excursion": 0, "bg_color": None, "text_color": None, "last_position": None}
+        if self.extra_clocks:
+            x, y = self.extra_clocks[-1].config["last_position"]
+            config["last_position"] = [x, y + self.settings["height"]]
+        self.settings["clocks"].append(config)
+        self.extra_clocks.append(ExtraClockWindow(self, config))
+        self.save_settings()
+        self.update_time()
+        self.extra_clocks[-1].edit()
+
+    def remove_clock(self, extra):
+        self.extra_clocks.remove(extra)
+        self.settings["clocks"].remove(extra.config)
+        extra.destroy()
+        self.save_settings()
+
+    def update_extra_clocks(self):
+        # Apply the main clock's appearance to the additional clocks
+        for extra in self.extra_clocks:
+            extra.apply_style()
+
+    def set_tick_stats(self, v):
+        # Start or stop recording tick lateness and the overlay reporting it
+        self.settings["show_tick_stats"] = v
+        if self.stats_job:
+            self.floating_window.after_cancel(self.stats_job)
+            self.stats_job = None
+        if v:
+            self.tick_stats = TickStats()
+            self.stats_label.config(text="")
+            self.stats_label.place(relx=0.5, rely=1.0, anchor="s")
+            self.stats_job = self.floating_window.after(1000, self.update_tick_stats)
+        else:
+            self.tick_stats = None
+            self.stats_label.place_forget()
+
+    def show_tick_stats(self, v):
+        # Toggle the overlay from the menu and keep the choice
+        self.set_tick_stats(v)
+        self.save_settings()
+
+    def update_tick_stats(self):
+        # Refresh the overlay once per second
+        report = self.tick_stats.report()
+        if report:
+            self.stats_label.config(text="late p50 {p50:.1f} p99 {p99:.1f} max {max:.1f} ms\n{rate:.1f}/s work {work:.2f} ms paint {applied}/{skipped}".format(**report, **self.renderer.stats()))
+        self.stats_job = self.floating_window.after(1000, self.update_tick_stats)
+
+    def online_sync(self):
+        # Start a background NTP sync, or cancel the one in progress
+        if self.ntp_worker.busy():
+            self.ntp_worker.cancel()
+            self.set_sync_status(self.texts["sync_cancelled"], self.texts["online_sync"])
+            self.schedule_auto_sync()
+            return
+        self.start_sync(manual=True)
+
+    def start_sync(self, manual=False):
+        # Query the NTP server in the background and poll for the result
+        self.sync_manual = manual
+        if self.sync_poll_job:
+            self.floating_window.after_cancel(self.sync_poll_job)
+        self.ntp_worker.start(split_servers(self.settings["ntp_server"]), self.settings["ntp_timeout"])
+        self.set_sync_status(self.texts["sync_running"], self.texts["cancel"])
+        self.sync_poll_job = self.floating_window.after(50, self.poll_sync)
+
+    def schedule_auto_sync(self):
+        # Arm the next automatic resync, if enabled
+        if self.auto_sync_job:
+            self.floating_window.after_cancel(self.auto_sync_job)
+            self.auto_sync_job = None
+        if self.settings["auto_sync_minutes"] > 0:
+            self.auto_sync_job = self.floating_window.after(self.settings["auto_sync_minutes"] * 60000, self.auto_sync)
+
+    def auto_sync(self):
+        self.auto_sync_job = None
+        if not self.ntp_worker.busy():
+            self.start_sync()
+
+    def poll_sync(self):
+        # Check for the sync result on the UI thread, only while a sync is running
+        self.sync_poll_job = None
+        # Read busy() first: a worker that is done has already queued its result
+        busy = self.ntp_worker.busy()
+        result = self.ntp_worker.poll()
+        if result is None:
+            if busy:
+                self.sync_poll_job = self.floating_window.after(50, self.poll_sync)
+            return
+        self.schedule_auto_sync()
+        status, value, delay, used, server = result
+        if status != "ok":
+            self.set_sync_status(self.texts["sync_failed"].format(error=value), self.texts["online_sync"])
+            return
+        # Add the sample to the drift estimate, automatic results are slewed in instead of stepped
+        self.clock.add_sync_sample(value * NS_PER_S, delay * NS_PER_S, slew=not self.sync_manual)
+        self.history.append(time.time_ns(), value * NS_PER_S, delay * NS_PER_S, self.clock.drift, server)
+        self.settings["time_excursion"] = self.clock.excursion_ms()
+        self.save_settings()
+        self.update_time()
+        if self.section_shown("time"):
+            self.set_entry(self.time_excursion_entry, self.settings["time_excursion"])
+        if len(split_servers(self.settings["ntp_server"])) > 1:
+            text = self.texts["sync_done_servers"].format(delay=round(delay * 1000), servers=used)
+        else:
+            text = self.texts["sync_done"].format(delay=round(delay * 1000))
+        self.set_sync_status(text, self.texts["online_sync"])
+
+    def set_sync_status(self, text, button_text):
+        # Remember the sync state and show it in the settings window if it was built
+        self.sync_status = (text, button_text)
+        if self.section_shown("time"):
+            self.sync_status_label.config(text=text)
+            self.sync_button.config(text=button_text)
 
     def quit_app(self):
         # Quit the application
+        self.settings["time_excursion"] = self.clock.excursion_ms()
         self.settings["last_position"] = [self.floating_window.winfo_x(), self.floating_window.winfo_y()]
         self.save_settings()
-        if self.settings_window and tk.Toplevel.winfo_exists(self.settings_window):
+        self.store.flush()
+        self.watcher.close()
+        if self.instance:
+            self.instance.close()
+        if self.settings_window:
             self.settings_window.destroy()
         self.floating_window.destroy()
         self.root.destroy()
 
+    def handle_command(self, command):
+        # Carry out a command given on the command line, also when forwarded by a later launch
+        if command == "quit":
+            self.quit_app()
+        elif command == "settings":
+            self.open_settings()
+        elif command == "sync":
+            if not self.ntp_worker.busy():
+                self.start_sync(manual=True)
+        else:
+            self.floating_window.deiconify()
+            self.floating_window.lift()
+
+    def reload_settings(self, new):
+        # The settings file was changed by another program: take over the changed keys and
+        # only update the widgets they affect. A new language takes effect at the next start.
+        changed = {k for k, v in new.items() if self.settings.get(k) != v}
+        if not changed:
+            return
+        for k in changed:
+            self.settings[k] = new[k]
+        if changed & {"bg_color", "text_color"}:
+            self.apply_colors()
+        elif changed & {"font_family", "time_font_size"}:
+            self.update_time_style()
+        if changed & {"font_family", "icon_size"}:
+            self.update_buttons()
+        if "bg_opacity" in changed:
+            self.floating_window.attributes("-alpha", self.settings["bg_opacity"])
+        if "is_movable" in changed:
+            self.is_movable = self.settings["is_movable"]
+            self.pin_button.config(text=self.get_lock_icon())
+        if changed & {"is_movable", "show_buttons_when_locked", "show_buttons_when_unlocked"}:
+            self.arrange_buttons()
+        if "clocks" in changed:
+            for extra in self.extra_clocks:
+                extra.destroy()
+            self.extra_clocks = [ExtraClockWindow(self, c) for c in self.settings["clocks"]]
+        if changed & {"width", "height", "last_position", "font_family", "time_font_size", "bg_opacity"}:
+            self.update_geometry()  # Also restyles the additional clocks
+        if "renderer" in changed:
+            self.set_renderer(self.settings["renderer"])
+        if changed & {"timer_mode", "countdown_seconds"}:
+            self.set_timer_mode(self.settings["timer_mode"])
+        if "show_tick_stats" in changed:
+            self.set_tick_stats(self.settings["show_tick_stats"])
+        if "auto_sync_minutes" in changed:
+            self.schedule_auto_sync()
+        if "time_excursion" in changed:
+            self.clock.set_excursion(self.settings["time_excursion"])
+        if changed & {"time_excursion", "time_precision_digits", "sync_interval", "clocks", "timer_mode", "countdown_seconds"}:
+            self.update_time()
+        if self.settings_window:
+            self.refresh_settings()
+
     def switch_lang_by_label(self, lb):
         # Switch the language by the language label
-        found_key = next((k for k, v in self.translations.items() if v["lang_label"] == lb), None)
+        found_key = translation.label_to_code.get(lb)
         if found_key and found_key != self.lang:
             confirm_message = self.texts["lang_switch_confirm"].format(language=lb)
             if messagebox.askyesno(self.texts["confirm"], confirm_message):
@@ -744,6 +1533,7 @@ class FloatingClockApp():
 
     def check_autostart(self):
         # Check if the application is set to autostart
+        import winreg as reg
         try:
             program_name = self.texts["app_name"]
             program_path = sys.executable
@@ -759,6 +1549,7 @@ class FloatingClockApp():
 
     def set_autostart(self, enable=True):
         # Set the application to autostart
+        import winreg as reg
         program_name = self.texts["app_name"]
         program_path = sys.executable
         reg_path = r"Software\Microsoft\Windows\CurrentVersion\Run"
@@ -776,5 +1567,10 @@ class FloatingClockApp():
         self.root.mainloop()
 
 if __name__ == "__main__":
-    # start with admin rights
-    FloatingClockApp().run()
+    command = single_instance.command_from_args(sys.argv[1:])
+    instance = single_instance.claim(CONFIG_FILE)
+    # Hand the command to the running instance instead of starting a second clock
+    if instance is None and single_instance.send(CONFIG_FILE, command):
+        sys.exit()
+    if command != "quit":
+        FloatingClockApp(instance, command).run()
@@ -0,0 +1,59 @@
+import argparse
+import statistics
+import time
+from contextlib import ExitStack
+from ntp_standin import NTPStandIn
+from ntp_sync import NTPSyncWorker
+
+# (name, true offset in s, stand-in settings for each server). The true offset is what a perfect sync would measure.
+SCENARIOS = [
+    ("lan", 0.250, [dict(offset=0.250, delay=0.001)]),
+    ("wan 80 ms", 0.250, [dict(offset=0.250, delay=0.080)]),
+    ("asymmetric 80 ms", 0.250, [dict(offset=0.250, delay=0.080, asymmetry=0.5)]),
+    ("jitter 40 ms", 0.250, [dict(offset=0.250, delay=0.030, jitter=0.040)]),
+    ("30% loss", 0.250, [dict(offset=0.250, delay=0.030, loss=0.3)]),
+    ("3 servers, 1 false", 0.250, [dict(offset=0.250, delay=0.030, jitter=0.020), dict(offset=0.250, delay=0.060, jitter=0.020), dict(offset=2.0, delay=0.010)]),
+    ("3 servers, 1 silent", 0.250, [dict(offset=0.250, delay=0.030), dict(offset=0.250, delay=0.120), dict(offset=0.250, loss=1.0)]),
+    ("unreachable", 0.250, [dict(offset=0.250, loss=1.0)]),
+]
+
+
+def run_sync(worker, servers, timeout):
+    # Go through the app's sync path: start the worker and poll it like the window does
+    start = time.perf_counter()
+    worker.start(servers, timeout)
+    while True:
+        result = worker.poll()
+        if result is not None:
+            return result, time.perf_counter() - start
+        time.sleep(0.005)
+
+
+def benchmark(runs, timeout, seed):
+    print("%-22s %8s %10s %10s %10s %10s" % ("scenario", "ok", "err mean", "err max", "lat p50", "lat max"))
+    for name, true_offset, servers in SCENARIOS:
+        errors, latencies, failures = [], [], []
+        with ExitStack() as stack:
+            standins = [stack.enter_context(NTPStandIn(seed=seed + i, **server)) for i, server in enumerate(servers)]
+            worker = NTPSyncWorker()
+            for _ in range(runs):
+                (status, value, delay, used, server), latency = run_sync(worker, [s.address for s in standins], timeout)
+                latencies.append(latency * 1000)
+                if status == "ok":
+                    errors.append(abs(value - true_offset) * 1000)
+                else:
+                    failures.append(value)
+        ok = "%d/%d" % (len(errors), runs)
+        if errors:
+            print("%-22s %8s %8.3fms %8.3fms %8.1fms %8.1fms" % (name, ok, statistics.mean(errors), max(errors), statistics.median(latencies), max(latencies)))
+        else:
+            print("%-22s %8s %10s %10s %8.1fms %8.1fms  %s" % (name, ok, "-", "-", statistics.median(latencies), max(latencies), failures[0]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure sync accuracy and latency against local NTP stand-ins")
+    parser.add_argument("--runs", type=int, default=10, help="syncs per scenario")
+    parser.add_argument("--timeout", type=float, default=2.0, help="ntp_timeout in seconds")
+    parser.add_argument("--seed", type=int, default=1, help="seed for the simulated jitter and loss")
+    args = parser.parse_args()
+    benchmark(args.runs, args.timeout, args.seed)
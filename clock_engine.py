@@ -0,0 +1,301 @@
+import time
+from collections import deque
+from datetime import datetime
+from sntp import SNTPClient
+
+NS_PER_MS = 1_000_000
+NS_PER_S = 1_000_000_000
+STEP_CHECK_NS = NS_PER_S  # How often the wall clock is compared with the anchored time
+STEP_THRESHOLD_NS = 250 * NS_PER_MS  # Wall clock deviations larger than this are treated as a step, smaller ones slewed out
+SLEW_RATE = 0.0005  # Fastest rate the displayed time is slewed at (500 ppm, 0.5 ms per second)
+SLEW_LIMIT_NS = NS_PER_S  # Corrections larger than this are stepped instead of slewed
+MAX_DRIFT = 0.0005  # Drift estimates beyond +/- 500 ppm are not trusted
+MIN_DRIFT_SPAN_NS = 600 * NS_PER_S  # Samples must span this long before a drift is fitted
+
+
+class SystemTimeSource():
+    # The real system clocks. perf_counter is monotonic too, but monotonic() only advances every
+    # 15.6 ms on Windows before Python 3.13, too coarse to place ticks or measure their lateness.
+    monotonic_ns = staticmethod(time.perf_counter_ns)
+    time_ns = staticmethod(time.time_ns)
+
+    def utc_offset_s(self, wall_s):
+        return time.localtime(wall_s).tm_gmtoff
+
+
+class VirtualTimeSource():
+    # Clocks that only move when advanced, for simulating ticks without waiting for them
+    def __init__(self, wall_ns=0, utc_offset_s=0, drift=0.0):
+        self.mono_ns = 0
+        self.wall_ns = wall_ns
+        self.utc_offset = utc_offset_s
+        self.drift = drift  # Rate error of the monotonic clock against the wall clock, in ns per ns
+
+    def monotonic_ns(self):
+        return self.mono_ns
+
+    def time_ns(self):
+        return self.wall_ns
+
+    def utc_offset_s(self, wall_s):
+        return self.utc_offset
+
+    def advance(self, ns):
+        # Let ns of wall time pass
+        self.wall_ns += ns
+        self.mono_ns += ns + int(ns * self.drift)
+
+    def step(self, ns):
+        # Step the wall clock, like a manual time change
+        self.wall_ns += ns
+
+
+class ClockDiscipline():
+    # History of (monotonic time, offset, delay) sync samples with a weighted linear fit of the drift
+    def __init__(self, max_samples=32):
+        self.samples = deque(maxlen=max_samples)
+
+    def reset(self):
+        self.samples.clear()
+
+    def add(self, mono_ns, offset_ns, delay_ns):
+        self.samples.append((mono_ns, offset_ns, delay_ns))
+
+    def estimate(self, mono_ns):
+        # Return (offset at mono_ns, drift in ns per ns), weighting samples by the inverse square of their delay
+        last_mono, last_offset, _ = self.samples[-1]
+        if len(self.samples) < 3 or last_mono - self.samples[0][0] < MIN_DRIFT_SPAN_NS:
+            return last_offset, 0.0
+        sw = sx = sy = sxx = sxy = 0.0
+        for t, offset, delay in self.samples:
+            w = 1.0 / (max(delay, 0) / NS_PER_MS + 1) ** 2
+            x = (t - last_mono) / NS_PER_S
+            y = offset - last_offset
+            sw += w
+            sx += w * x
+            sy += w * y
+            sxx += w * x * x
+            sxy += w * x * y
+        den = sw * sxx - sx * sx
+        if den <= 0:
+            return last_offset, 0.0
+        slope = (sw * sxy - sx * sy) / den  # ns per second
+        intercept = (sy - slope * sx) / sw
+        drift = max(-MAX_DRIFT, min(slope / NS_PER_S, MAX_DRIFT))
+        return last_offset + int(intercept + drift * (mono_ns - last_mono)), drift
+
+
+class ClockZone():
+    # UTC offset of an additional clock: an IANA time zone followed across DST changes, or else a fixed
+    # offset in minutes, or else local time. zoneinfo needs the tzdata package on Windows.
+    def __init__(self, name=None, utc_offset_minutes=None):
+        self.zone = None
+        if name:
+            try:
+                from zoneinfo import ZoneInfo
+                self.zone = ZoneInfo(name)
+            except (ImportError, KeyError, ValueError) as e:  # Unknown names raise ZoneInfoNotFoundError, a KeyError
+                print(e)
+        self.offset_ns = None if utc_offset_minutes is None else int(utc_offset_minutes) * 60 * NS_PER_S
+        self.next_check_ns = 0
+
+    def utc_offset_ns(self, now_ns):
+        # Offset at now_ns, None for local time. A zone's offset is looked up again at every minute boundary.
+        if self.zone is not None and now_ns >= self.next_check_ns:
+            offset = datetime.fromtimestamp(now_ns // NS_PER_S, self.zone).utcoffset()
+            self.offset_ns = int(offset.total_seconds()) * NS_PER_S
+            self.next_check_ns = (now_ns // (60 * NS_PER_S) + 1) * 60 * NS_PER_S
+        return self.offset_ns
+
+
+class ClockEngine():
+    # Wall time derived from the monotonic clock, re-anchored only on wall clock steps. Smaller deviations,
+    # like small corrections or the two clocks running at slightly different rates, are slewed out.
+    # Independent of Tk: the window asks it for the text to show and how long to sleep until the next change.
+    def __init__(self, excursion_ms=0, source=None, ntp_client=None):
+        self.source = source or SystemTimeSource()
+        self.ntp_client = ntp_client or SNTPClient()  # Anything with SNTPClient's request()
+        self.discipline = ClockDiscipline()
+        self.anchor()
+        self.set_excursion(excursion_ms)
+        self.tick_lateness = 0  # Smoothed lateness (ns) of tick callbacks against the time they were asked for
+        self.reset_schedule()
+
+    def anchor(self):
+        # Pin the wall clock and the local UTC offset to the current monotonic reading
+        self.anchor_mono_ns = self.source.monotonic_ns()
+        self.anchor_wall_ns = self.source.time_ns()
+        self.wall_slew_ns = 0  # Deviation from the wall clock being slewed out since the anchor
+        self.next_check_ns = self.anchor_mono_ns + STEP_CHECK_NS
+        self.update_utc_offset(self.anchor_wall_ns)
+        self.discipline.reset()  # Samples were measured against the old anchor
+
+    def follow_wall(self, mono_ns, deviation_ns):
+        # Move the anchor to mono_ns without a jump and start slewing out the wall clock's deviation from it
+        self.anchor_wall_ns = self.anchored_ns(mono_ns)
+        self.anchor_mono_ns = mono_ns
+        self.wall_slew_ns = deviation_ns
+
+    def anchored_ns(self, mono_ns):
+        # Wall time carried forward from the anchor by the monotonic clock, with the slew done so far
+        wall_ns = self.anchor_wall_ns + mono_ns - self.anchor_mono_ns
+        if self.wall_slew_ns:
+            done_ns = min(abs(self.wall_slew_ns), int((mono_ns - self.anchor_mono_ns) * SLEW_RATE))
+            wall_ns += done_ns if self.wall_slew_ns > 0 else -done_ns
+        return wall_ns
+
+    def update_utc_offset(self, wall_ns):
+        # Read the local UTC offset, refreshed at every minute boundary to follow DST changes
+        self.utc_offset_ns = self.source.utc_offset_s(wall_ns // NS_PER_S) * NS_PER_S
+        self.next_utc_check_ns = (wall_ns // (60 * NS_PER_S) + 1) * 60 * NS_PER_S
+
+    def set_excursion(self, excursion_ms, drift=0.0):
+        # Step to an offset, drifting from now at the given rate, and drop any slew in progress
+        self.offset_ns = int(excursion_ms) * NS_PER_MS
+        self.drift = drift
+        self.ref_mono_ns = self.source.monotonic_ns()
+        self.slew_ns = 0
+        self.slew_start_ns = self.ref_mono_ns
+
+    def excursion_ms(self):
+        # The offset currently aimed at, in whole ms, for saving as time_excursion
+        return round((self.offset_ns + self.drift * (self.source.monotonic_ns() - self.ref_mono_ns)) / NS_PER_MS)
+
+    def add_sync_sample(self, offset_ns, delay_ns, slew=True):
+        # Feed an NTP result (server minus system time) and slew (or step) toward the new estimate
+        self.wall_ns()  # Re-anchor first if the system clock was stepped
+        mono_ns = self.source.monotonic_ns()
+        # Measure against where the anchored wall clock is heading once its slew is done
+        offset_ns = int(offset_ns) + self.source.time_ns() - (self.anchor_wall_ns + mono_ns - self.anchor_mono_ns + self.wall_slew_ns)
+        self.discipline.add(mono_ns, offset_ns, int(delay_ns))
+        offset_ns, drift = self.discipline.estimate(mono_ns)
+        applied_ns = self.offset_at(mono_ns)
+        self.offset_ns, self.drift, self.ref_mono_ns = offset_ns, drift, mono_ns
+        residual_ns = applied_ns - offset_ns
+        if not slew or abs(residual_ns) > SLEW_LIMIT_NS:
+            self.slew_ns = 0
+        else:
+            self.slew_ns = residual_ns
+            self.slew_start_ns = mono_ns
+
+    def offset_at(self, mono_ns):
+        # Excursion plus drift correction, with the remaining slew still to be worked off
+        offset_ns = self.offset_ns
+        if self.drift:
+            offset_ns += int(self.drift * (mono_ns - self.ref_mono_ns))
+        if self.slew_ns:
+            left_ns = abs(self.slew_ns) - int((mono_ns - self.slew_start_ns) * SLEW_RATE)
+            if left_ns <= 0:
+                self.slew_ns = 0
+            else:
+                offset_ns += left_ns if self.slew_ns > 0 else -left_ns
+        return offset_ns
+
+    def wall_ns(self):
+        # Current system wall time in ns, without the excursion
+        return self.wall_at(self.source.monotonic_ns())
+
+    def wall_at(self, mono_ns):
+        if mono_ns >= self.next_check_ns:
+            self.next_check_ns = mono_ns + STEP_CHECK_NS
+            deviation_ns = self.source.time_ns() - self.anchored_ns(mono_ns)
+            if abs(deviation_ns) > STEP_THRESHOLD_NS:
+                # Suspend/resume or a manual time change
+                self.anchor()
+                mono_ns = self.anchor_mono_ns
+            else:
+                # e.g. QPC on Windows is not slewed along with the system time
+                self.follow_wall(mono_ns, deviation_ns)
+        wall_ns = self.anchored_ns(mono_ns)
+        if wall_ns >= self.next_utc_check_ns:
+            self.update_utc_offset(wall_ns)
+        return wall_ns
+
+    def now_ns(self):
+        # Displayed time in ns since the epoch (UTC), including the excursion
+        mono_ns = self.source.monotonic_ns()
+        return self.wall_at(mono_ns) + self.offset_at(mono_ns)
+
+    def fields(self, now_ns, digits, utc_offset_ns=None):
+        # Split a time into hours, minutes, seconds and the fraction shown with the given digits,
+        # in local time unless another UTC offset is given
+        if utc_offset_ns is None:
+            utc_offset_ns = self.utc_offset_ns
+        secs, frac_ns = divmod(now_ns + utc_offset_ns, NS_PER_S)
+        return secs // 3600 % 24, secs // 60 % 60, secs % 60, frac_ns // 10 ** (9 - digits)
+
+    def format(self, now_ns, digits, utc_offset_ns=None):
+        # Format a time as HH:MM:SS with the given number of fractional digits
+        h, m, s, frac = self.fields(now_ns, digits, utc_offset_ns)
+        if digits > 0:
+            return "%02d:%02d:%02d.%0*d" % (h, m, s, digits, frac)
+        return "%02d:%02d:%02d" % (h, m, s)
+
+    def reset_schedule(self):
+        # Forget the pending tick, e.g. when the display is refreshed out of schedule.
+        # The smoothed lateness is kept, it describes the timer and not the pending tick.
+        self.tick_target = None  # Displayed time (ns) the next tick is aimed at
+        self.tick_lead = 0  # How early (ns) the pending tick was asked for
+        self.last_lateness = None  # Lateness (ns) of the last tick against its boundary, None if unscheduled
+        self.last_now_ns = 0  # Displayed time the last tick rendered
+
+    def tick(self, digits, interval_ms, offsets_ns=()):
+        # Return the text to show now and the delay (ns) until the next visible change, also of
+        # clocks shown offsets_ns ahead of this one
+        now_ns = self.now_ns()
+        step = tick_step_ns(digits, interval_ms)
+        self.last_lateness = None
+        if self.tick_target is not None:
+            # Track how late the callbacks fire against the wake time asked for, which is the boundary
+            # minus the lead, and snap to the boundary if we woke slightly early
+            lateness = self.last_lateness = now_ns - self.tick_target
+            self.tick_lateness += (lateness + self.tick_lead - self.tick_lateness) // 8
+            if -self.tick_lead_ns(step) <= lateness < 0:
+                now_ns = self.tick_target
+        self.last_now_ns = now_ns
+        # Aim at the next step boundary of any of the clocks, firing early by the measured lateness
+        self.tick_target = next_boundary_ns(now_ns, step, (0, *offsets_ns))
+        self.tick_lead = self.tick_lead_ns(step)
+        return self.format(now_ns, digits), self.tick_target - now_ns - self.tick_lead
+
+    def tick_lead_ns(self, step):
+        # How early to fire to compensate for the average callback lateness
+        return max(0, min(self.tick_lateness, step // 2))
+
+    def sync(self, server, timeout=5, slew=True):
+        # Query an NTP server synchronously and apply the result, return (offset, delay) in seconds
+        host, port = split_server(server)
+        response = self.ntp_client.request(host, port=port, timeout=timeout)
+        self.add_sync_sample(response.offset * NS_PER_S, response.delay * NS_PER_S, slew)
+        return response.offset, response.delay
+
+
+def tick_step_ns(digits, interval_ms):
+    # Interval between visible changes: one unit of the last shown digit, never shorter than interval_ms
+    unit = 10 ** (3 - digits)
+    interval = max(1, int(interval_ms))
+    return -(-interval // unit) * unit * NS_PER_MS
+
+
+def next_boundary_ns(now_ns, step, offsets_ns):
+    # Earliest time after now_ns at which a clock shown offset ns ahead reaches a step boundary
+    return min(((now_ns + offset) // step + 1) * step - offset for offset in offsets_ns)
+
+
+def split_server(server, default_port=123):
+    # Accept "host" or "host:port"
+    host, sep, port = server.rpartition(":")
+    if sep and port.isdigit():
+        return host, int(port)
+    return server, default_port
+
+
+def simulate(engine, seconds, digits, interval_ms, latency_ns=0):
+    # Fast-forward an engine on a VirtualTimeSource, yielding (text, delay_ns) for every tick
+    source = engine.source
+    end_ns = source.monotonic_ns() + seconds * NS_PER_S
+    while source.monotonic_ns() < end_ns:
+        text, delay_ns = engine.tick(digits, interval_ms)
+        yield text, delay_ns
+        # Tk's after() works in whole ms and fires late by the given latency
+        source.advance(max(1, -(-delay_ns // NS_PER_MS)) * NS_PER_MS + latency_ns)
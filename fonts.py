@@ -0,0 +1,57 @@
+from tkinter import font as tkfont
+
+
+def sample_text(digits):
+    # Widest time string for the given precision
+    return "89:88:88" + ("." + "8" * digits if digits > 0 else "")
+
+
+class TextMetricsCache():
+    # Size the time label needs, measured off-widget and cached per (font family, size, precision digits)
+    def __init__(self, label):
+        self.label = label
+        self.sizes = {}
+
+    def label_size(self, family, size, digits):
+        # Return (width, height) of the label showing the widest time string
+        key = (family, size, digits)
+        if key not in self.sizes:
+            f = tkfont.Font(root=self.label, family=family, size=size)
+            px = lambda option: self.label.winfo_pixels(self.label.cget(option))
+            border = px("borderwidth") + px("highlightthickness")
+            w = f.measure(sample_text(digits)) + 2 * (border + px("padx"))
+            h = f.metrics("linespace") + 2 * (border + px("pady"))
+            self.sizes[key] = (w, h)
+        return self.sizes[key]
+
+
+class FontCatalog():
+    # Sorted font families with a name -> index map, built on first use and refreshed only on demand
+    def __init__(self, root):
+        self.root = root
+        self.lists = {}  # monospace flag -> (sorted names, name -> index)
+
+    def refresh(self):
+        # Forget the cached lists, e.g. after fonts were installed
+        self.lists = {}
+
+    def catalog(self, monospace):
+        if monospace not in self.lists:
+            if monospace:
+                names = [n for n in self.families() if tkfont.Font(root=self.root, family=n).metrics("fixed")]
+            else:
+                names = sorted(set(tkfont.families(self.root)))
+            self.lists[monospace] = (names, {n: i for i, n in enumerate(names)})
+        return self.lists[monospace]
+
+    def families(self, monospace=False):
+        return self.catalog(monospace)[0]
+
+    def neighbour(self, current, step, monospace=False):
+        # Return the family step places away from current, or None at either end
+        names, index = self.catalog(monospace)
+        # A family missing from the list, e.g. not monospace, steps to the first or the last one
+        idx = index.get(current, -1 if step > 0 else len(names)) + step
+        if 0 <= idx < len(names):
+            return names[idx]
+        return None
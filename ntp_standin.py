@@ -0,0 +1,73 @@
+import random
+import socket
+import threading
+import time
+from sntp import PACKET, MODE_SERVER, to_ntp
+
+NS_PER_S = 1_000_000_000
+
+
+class NTPStandIn():
+    # Local UDP NTP server with a known clock offset and a simulated network path, for testing syncs offline.
+    # delay is the round trip in seconds, asymmetry in [-1, 1] moves it toward the request (+) or the reply (-) path,
+    # jitter adds up to that many seconds to each path and loss is the chance a request or reply is dropped.
+    def __init__(self, offset=0.0, delay=0.0, asymmetry=0.0, jitter=0.0, loss=0.0, seed=None, host="127.0.0.1", port=0):
+        self.offset_ns = int(offset * NS_PER_S)
+        self.delay = delay
+        self.asymmetry = asymmetry
+        self.jitter = jitter
+        self.loss = loss
+        self.random = random.Random(seed)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+        self.address = "%s:%d" % self.sock.getsockname()  # For ntp_server
+        self.requests = 0
+        self.thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.sock.close()
+
+    def path_delays(self):
+        # Seconds the request and the reply spend on the way
+        half = self.delay / 2
+        return (half * (1 + self.asymmetry) + self.random.uniform(0, self.jitter),
+                half * (1 - self.asymmetry) + self.random.uniform(0, self.jitter))
+
+    def run(self):
+        while True:
+            try:
+                data, client = self.sock.recvfrom(512)
+            except OSError:
+                return  # Closed
+            self.requests += 1
+            if len(data) < PACKET.size or self.random.random() < self.loss:
+                continue
+            there, back = self.path_delays()
+            drop_reply = self.random.random() < self.loss
+            threading.Thread(target=self.reply, args=(data, client, there, back, drop_reply), daemon=True).start()
+
+    def reply(self, data, client, there, back, drop_reply):
+        # Answer one request, as if it arrived after there seconds and the reply took back seconds
+        time.sleep(there)
+        version = PACKET.unpack_from(data)[0] >> 3 & 7
+        receive = to_ntp(time.time_ns() + self.offset_ns)
+        transmit = to_ntp(time.time_ns() + self.offset_ns)
+        packet = PACKET.pack(version << 3 | MODE_SERVER, 1, 4, -20, 0, 0, 0x4C4F434C, receive, PACKET.unpack_from(data)[10], receive, transmit)
+        time.sleep(back)
+        if drop_reply:
+            return
+        try:
+            self.sock.sendto(packet, client)
+        except OSError:
+            pass
@@ -0,0 +1,128 @@
+import queue
+import threading
+import time
+from clock_engine import split_server
+from sntp import SNTPClient
+
+
+class NTPSyncWorker():
+    # Query NTP servers on a background thread and hand the result back through a thread-safe queue
+    def __init__(self, client=None):
+        self.client = client or SNTPClient()  # Anything with SNTPClient's request()
+        self.results = queue.Queue()
+        self.generation = 0  # Identifies the current request, results of older requests are dropped
+        self.thread = None
+
+    def busy(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self, servers, timeout):
+        # Query the servers at once within timeout seconds, unless a request is already running.
+        # Return whether it was started.
+        if self.busy():
+            return False
+        self.generation += 1
+        self.thread = threading.Thread(target=self.run, args=(self.generation, servers, timeout), daemon=True)
+        self.thread.start()
+        return True
+
+    def cancel(self):
+        # Forget the running request, its socket times out on its own and the result is discarded
+        self.generation += 1
+        self.thread = None
+
+    def run(self, generation, servers, timeout):
+        try:
+            offset, delay, used, server = query_servers(self.client, servers, timeout)
+            self.results.put((generation, "ok", offset, delay, used, server))
+        except Exception as e:
+            self.results.put((generation, "error", e, None, 0, None))
+
+    def poll(self):
+        # Return (status, offset_or_error, delay, servers agreeing, server used) of the current request
+        # if it finished, otherwise None
+        while True:
+            try:
+                generation, status, value, delay, used, server = self.results.get_nowait()
+            except queue.Empty:
+                return None
+            if generation == self.generation:
+                return status, value, delay, used, server
+
+
+def split_servers(text):
+    # Accept one server or a comma separated list of them
+    return [server.strip() for server in text.split(",") if server.strip()]
+
+
+def query(client, server, timeout):
+    # Return (offset, delay, error bound) in seconds and the server, offset is server minus local time,
+    # already compensated for the round trip
+    host, port = split_server(server)
+    response = client.request(host, port=port, timeout=timeout)
+    # The true offset lies within half the round trip of the measured one, widened by the server's own distance to its reference
+    error = response.delay / 2 + getattr(response, "root_delay", 0) / 2 + getattr(response, "root_dispersion", 0)
+    return response.offset, response.delay, error, server
+
+
+def query_into(answers, client, server, timeout):
+    # Put (sample, None) or (None, error) of one server into the answers queue
+    try:
+        answers.put((query(client, server, timeout), None))
+    except Exception as e:
+        answers.put((None, e))
+
+
+def query_servers(client, servers, timeout):
+    # Query all servers concurrently under one deadline and return (offset, delay, servers agreeing, server)
+    # of the lowest-delay sample among the servers that agree with the majority. Returns as soon as
+    # a majority of all servers agrees, so a silent server does not hold up the sync.
+    if not servers:
+        raise ValueError("no NTP server")
+    deadline = time.monotonic() + timeout
+    answers = queue.Queue()
+    for server in servers:
+        # Daemon threads, so quitting never waits for a silent server. Requests still running when
+        # the majority agrees time out on their own and are ignored.
+        threading.Thread(target=query_into, args=(answers, client, server, timeout), daemon=True).start()
+    samples = []
+    error = TimeoutError("no response within %s s" % timeout)
+    for _ in servers:
+        try:
+            sample, e = answers.get(timeout=max(0, deadline - time.monotonic()))
+        except queue.Empty:
+            break
+        if e is None:
+            samples.append(sample)
+        else:
+            error = e
+        if samples and select_truechimers(samples)[0] * 2 > len(servers):
+            break
+    if not samples:
+        raise error
+    count, truechimers = select_truechimers(samples)
+    if count * 2 <= len(samples):
+        # e.g. two servers that disagree: there is no telling which one is right
+        raise ValueError("no majority of %d servers agrees on the time" % len(samples))
+    offset, delay, _, server = min(truechimers, key=lambda sample: sample[1])
+    return offset, delay, count, server
+
+
+def select_truechimers(samples):
+    # Marzullo's algorithm: find the range covered by the most (offset +/- error) intervals,
+    # return how many cover it and those samples
+    edges = []
+    for offset, _, error, _ in samples:
+        edges.append((offset - error, 0))  # Starts sort before ends at the same point, so touching intervals agree
+        edges.append((offset + error, 1))
+    edges.sort()
+    best = count = 0
+    lo = hi = 0.0
+    for i, (point, end) in enumerate(edges):
+        if end:
+            count -= 1
+            continue
+        count += 1
+        if count > best:
+            best, lo, hi = count, point, edges[i + 1][0]
+    return best, [s for s in samples if s[0] - s[2] <= lo and hi <= s[0] + s[2]]
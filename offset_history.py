@@ -0,0 +1,58 @@
+import os
+import struct
+
+RECORD = struct.Struct("<qqqd48s")  # System time, offset and delay (ns), drift (ns per ns), server name
+
+
+class OffsetHistory():
+    # Sync results appended to a file of fixed-size records, read back in one go.
+    # Once the file holds twice max_records it is cut back to the newest max_records.
+    def __init__(self, path, max_records=256):
+        self.path = path
+        self.max_records = max_records
+
+    def append(self, wall_ns, offset_ns, delay_ns, drift, server):
+        record = RECORD.pack(int(wall_ns), int(offset_ns), int(delay_ns), float(drift), server.encode("utf-8")[:48])
+        try:
+            size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+            if size % RECORD.size:
+                os.truncate(self.path, size - size % RECORD.size)  # Drop a record cut short by a crash
+            if size >= 2 * self.max_records * RECORD.size:
+                self.compact()
+            with open(self.path, "ab") as f:
+                f.write(record)
+        except OSError as e:
+            print(e)
+
+    def compact(self):
+        # Keep the newest max_records, replacing the file atomically
+        with open(self.path, "rb") as f:
+            data = f.read()
+        keep = len(data) // RECORD.size * RECORD.size
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data[max(0, keep - self.max_records * RECORD.size):keep])
+        os.replace(tmp, self.path)
+
+    def records(self):
+        # All (wall_ns, offset_ns, delay_ns, drift, server) records, oldest first
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return []
+        records = []
+        for wall_ns, offset_ns, delay_ns, drift, server in RECORD.iter_unpack(data[:len(data) // RECORD.size * RECORD.size]):
+            records.append((wall_ns, offset_ns, delay_ns, drift, server.rstrip(b"\0").decode("utf-8", "replace")))
+        return records
+
+    def best(self, now_ns, ttl_ns, max_delay_ns):
+        # The lowest-delay record taken within ttl_ns before now_ns, None if there is none
+        fresh = [r for r in self.records() if 0 <= now_ns - r[0] <= ttl_ns and r[2] <= max_delay_ns]
+        return min(fresh, key=lambda r: r[2]) if fresh else None
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
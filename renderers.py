@@ -0,0 +1,95 @@
+from tkinter import font as tkfont
+
+
+class LabelRenderer():
+    # Push time strings to a tk.Label, only touching Tk when the text really changes
+    def __init__(self, label):
+        self.label = label
+        self.last_text = None
+        self.applied = 0  # Repaints sent to Tk
+        self.skipped = 0  # Repaints avoided because the text was unchanged
+
+    def render(self, text):
+        # Show the text, return whether the widget was updated
+        if text == self.last_text:
+            self.skipped += 1
+            return False
+        self.label.config(text=text)
+        self.last_text = text
+        self.applied += 1
+        return True
+
+    def invalidate(self):
+        # Forget the shown text so the next render repaints unconditionally
+        self.last_text = None
+
+    def stats(self):
+        return {"applied": self.applied, "skipped": self.skipped}
+
+    def set_style(self, font, bg, fg):
+        self.label.config(font=font, bg=bg, fg=fg)
+
+
+class CanvasRenderer():
+    # Draw each character in its own fixed-position canvas text item and only update the cells that changed
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.items = []  # One text item per character cell
+        self.width = 0  # Total width of the cells
+        self.offset = (0, 0)  # Where the cells are currently moved to
+        self.last_text = None
+        self.applied = 0
+        self.skipped = 0
+        canvas.bind("<Configure>", lambda e: self.center())
+
+    def set_style(self, font, bg, fg):
+        # Measure the digit cell width once, all digits share the widest one so the layout never shifts
+        self.font = tkfont.Font(root=self.canvas, font=font)
+        self.digit_w = max(self.font.measure(d) for d in "0123456789")
+        self.fg = fg
+        self.canvas.config(bg=bg)
+        text, self.last_text = self.last_text, None
+        self.items = []
+        if text:
+            self.render(text)
+
+    def build(self, text):
+        # Lay out one cell per character of the current time format
+        self.canvas.delete("cell")
+        self.items = []
+        x = 0
+        for c in text:
+            w = self.digit_w if c.isdigit() else self.font.measure(c)
+            self.items.append(self.canvas.create_text(x + w // 2, 0, text="", font=self.font, fill=self.fg, tags="cell"))
+            x += w
+        self.width = x
+        self.offset = (0, 0)
+        self.center()
+
+    def center(self):
+        x = (self.canvas.winfo_width() - self.width) // 2
+        y = self.canvas.winfo_height() // 2
+        self.canvas.move("cell", x - self.offset[0], y - self.offset[1])
+        self.offset = (x, y)
+
+    def render(self, text):
+        # Show the text, return whether any cell was updated
+        if text == self.last_text:
+            self.skipped += 1
+            return False
+        old = self.last_text
+        if old is None or len(old) != len(text) or not self.items:
+            self.build(text)
+            old = " " * len(text)
+        for i, c in enumerate(text):
+            if c != old[i]:
+                self.canvas.itemconfigure(self.items[i], text=c)
+        self.last_text = text
+        self.applied += 1
+        return True
+
+    def invalidate(self):
+        self.last_text = None
+
+    def stats(self):
+        return {"applied": self.applied, "skipped": self.skipped}
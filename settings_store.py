@@ -0,0 +1,126 @@
+import ctypes
+import json
+import os
+import sys
+
+IN_CLOSE_WRITE = 0x08
+IN_MOVED_TO = 0x80
+
+
+class SettingsStore():
+    # Write-behind persistence: coalesce saves into one atomic write after a quiet period
+    def __init__(self, path, widget, delay=500):
+        self.path = path
+        self.widget = widget  # Any Tk widget, used for after() scheduling
+        self.delay = delay  # Quiet period in ms
+        self.settings = None
+        self.job = None
+        self.written = None  # file_signature() of our last write, so the watcher can ignore it
+
+    def save(self, settings):
+        # Schedule a write, restarting the quiet period
+        self.settings = settings
+        if self.job:
+            self.widget.after_cancel(self.job)
+        self.job = self.widget.after(self.delay, self.flush)
+
+    def flush(self):
+        # Write pending changes now, if any
+        if self.job:
+            self.widget.after_cancel(self.job)
+            self.job = None
+        if self.settings is None:
+            return
+        write_atomic(self.path, self.settings)
+        self.written = file_signature(self.path)
+        self.settings = None
+
+
+class SettingsWatcher():
+    # Call on_change(settings) when the settings file is changed by someone else.
+    # Uses inotify on Linux, elsewhere the modification time is polled at a low rate.
+    def __init__(self, store, on_change, poll_ms=2000):
+        self.store = store
+        self.path = store.path
+        self.widget = store.widget
+        self.on_change = on_change
+        self.poll_ms = poll_ms
+        self.seen = file_signature(self.path)
+        self.fd = open_inotify(os.path.dirname(self.path) or ".")
+        if self.fd is not None:
+            import tkinter  # Imported here so the terminal clock can use this module without Tk
+            self.widget.tk.createfilehandler(self.fd, tkinter.READABLE, self.on_inotify)
+        else:
+            self.job = self.widget.after(self.poll_ms, self.poll)
+
+    def on_inotify(self, fd, mask):
+        # Drain the events, then look at the file itself
+        try:
+            while os.read(fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+        self.check()
+
+    def poll(self):
+        self.check()
+        self.job = self.widget.after(self.poll_ms, self.poll)
+
+    def check(self):
+        sig = file_signature(self.path)
+        if sig is None or sig == self.seen:
+            return
+        self.seen = sig
+        if sig == self.store.written:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                settings = json.load(f)
+        except (OSError, ValueError):
+            return  # Half written or invalid, wait for the next change
+        if isinstance(settings, dict):
+            self.on_change(settings)
+
+    def close(self):
+        if self.fd is not None:
+            self.widget.tk.deletefilehandler(self.fd)
+            os.close(self.fd)
+            self.fd = None
+        else:
+            self.widget.after_cancel(self.job)
+
+
+def file_signature(path):
+    # (mtime, size) of a file, None if it does not exist
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def open_inotify(directory):
+    # Non-blocking inotify descriptor watching files written or moved into directory, None if unavailable
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    if libc.inotify_add_watch(fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+def write_atomic(path, settings):
+    # Write to a temporary file and rename it over the target, so a crash never leaves a truncated file
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(settings, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
@@ -0,0 +1,99 @@
+import os
+import queue
+import socket
+import threading
+import zlib
+
+COMMANDS = ("show", "settings", "sync", "quit")
+HELLO = "TimeWindow"  # First word of every request, so unrelated programs on the port are not mistaken for us
+DRAIN_MS = 200  # How often the Tk thread picks up received commands
+
+
+class InstanceServer():
+    # Listening socket held by the running instance, receives the commands of later launches
+    def __init__(self, sock):
+        self.sock = sock
+        self.commands = queue.Queue()
+        self.widget = None
+        self.handler = None
+
+    def serve(self, widget, handler):
+        # Accept commands on a background thread and call handler(command) for them on the Tk thread.
+        # The accept thread never calls Tk, it would fail before mainloop runs or while Tk shuts down.
+        self.widget = widget
+        self.handler = handler
+        threading.Thread(target=self.run, daemon=True).start()
+        widget.after(DRAIN_MS, self.dispatch)
+
+    def run(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return  # Closed
+            with conn:
+                try:
+                    conn.settimeout(1)
+                    hello, _, command = conn.recv(64).decode("ascii", "replace").strip().partition(" ")
+                    if hello != HELLO or command not in COMMANDS:
+                        continue
+                    self.commands.put(command)  # Queued before the reply, so an acknowledged command is never lost
+                    conn.sendall(b"ok\n")
+                except OSError:
+                    continue
+
+    def dispatch(self):
+        # Run the received commands and check again in DRAIN_MS, until closed
+        while self.widget is not None:
+            try:
+                command = self.commands.get_nowait()
+            except queue.Empty:
+                self.widget.after(DRAIN_MS, self.dispatch)
+                return
+            self.handler(command)
+
+    def close(self):
+        self.sock.close()
+        self.widget = None
+
+
+def instance_port(key):
+    # Loopback port for the instance using the settings file key, in the dynamic port range
+    return 49152 + zlib.crc32(os.path.normcase(os.path.abspath(key)).encode("utf-8")) % 16384
+
+
+def claim(key):
+    # Become the running instance for key: return an InstanceServer, or None if the port is taken
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    if os.name == "nt":
+        # Keep other processes from binding the port as well
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1)
+    else:
+        # Only skips TIME_WAIT of an earlier instance, two listeners are still refused
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    try:
+        sock.bind(("127.0.0.1", instance_port(key)))
+        sock.listen(4)
+    except OSError:
+        sock.close()
+        return None
+    return InstanceServer(sock)
+
+
+def send(key, command, timeout=1.0):
+    # Forward a command to the running instance for key, return whether it acknowledged it
+    try:
+        with socket.create_connection(("127.0.0.1", instance_port(key)), timeout=timeout) as conn:
+            conn.sendall(("%s %s\n" % (HELLO, command)).encode("ascii"))
+            return conn.recv(16).startswith(b"ok")
+    except OSError:
+        return False
+
+
+def command_from_args(args):
+    # The command given on the command line as --show, --settings, --sync or --quit, "show" by default
+    for arg in args:
+        name = arg.lstrip("-")
+        if name in COMMANDS:
+            return name
+    return "show"
@@ -0,0 +1,99 @@
+import socket
+import struct
+import time
+
+NS_PER_S = 1_000_000_000
+NTP_EPOCH_OFFSET = 2208988800  # Seconds from 1900, the NTP epoch, to 1970
+PACKET = struct.Struct("!BBbbIIIQQQQ")  # 48 byte NTP header
+MODE_CLIENT = 3
+MODE_SERVER = 4
+
+
+class SNTPResponse():
+    # The sample kept from a burst, offset and delay in seconds like ntplib's NTPStats
+    def __init__(self, offset_ns, delay_ns, stratum, root_delay, root_dispersion, samples):
+        self.offset = offset_ns / NS_PER_S  # Server minus local time, compensated for the round trip
+        self.delay = delay_ns / NS_PER_S  # Round trip, without the time the server held the request
+        self.stratum = stratum
+        self.root_delay = root_delay
+        self.root_dispersion = root_dispersion
+        self.samples = samples  # Valid replies received in the burst
+
+
+class SNTPClient():
+    # Minimal SNTP client with ntplib.NTPClient's request(). Sends a burst of requests over one UDP
+    # socket and keeps the reply with the shortest round trip, the one least delayed by queueing.
+    def __init__(self, burst=4, spacing=0.02):
+        self.burst = burst  # Requests per sync
+        self.spacing = spacing  # Seconds between the requests of a burst
+
+    def request(self, host, port=123, version=4, timeout=5):
+        # Return the best SNTPResponse of a burst, all requests together take at most timeout seconds
+        deadline = time.perf_counter() + timeout
+        family, _, _, _, address = socket.getaddrinfo(host, port, 0, socket.SOCK_DGRAM)[0]
+        best = None
+        samples = 0
+        with socket.socket(family, socket.SOCK_DGRAM) as sock:
+            sock.connect(address)  # Only replies from the server are delivered
+            for i in range(self.burst):
+                if i:
+                    time.sleep(min(self.spacing, max(0.0, deadline - time.perf_counter())))
+                if time.perf_counter() >= deadline:
+                    break
+                # A lost reply only costs its share of the timeout
+                sample = self.exchange(sock, version, min(deadline, time.perf_counter() + timeout / self.burst))
+                if sample is None:
+                    continue
+                samples += 1
+                if best is None or sample[1] < best[1]:
+                    best = sample
+        if best is None:
+            raise TimeoutError("no valid reply from %s" % host)
+        return SNTPResponse(*best, samples)
+
+    def exchange(self, sock, version, deadline):
+        # Send one request and wait for its reply until deadline.
+        # Return (offset_ns, delay_ns, stratum, root_delay, root_dispersion), None if it was lost or invalid.
+        # Local times are read once from the wall clock, the round trip from perf_counter,
+        # which is much finer than the wall clock on Windows.
+        t1_ns = time.time_ns()
+        start = time.perf_counter_ns()
+        transmit = to_ntp(t1_ns)
+        try:
+            sock.send(PACKET.pack(version << 3 | MODE_CLIENT, 0, 0, 0, 0, 0, 0, 0, 0, 0, transmit))
+        except OSError:
+            return None
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return None
+            sock.settimeout(remaining)
+            try:
+                data = sock.recv(512)
+            except socket.timeout:
+                return None
+            except OSError:
+                return None  # e.g. ICMP port unreachable
+            t4_ns = t1_ns + time.perf_counter_ns() - start
+            if len(data) < PACKET.size:
+                continue
+            li_vn_mode, stratum, _, _, root_delay, root_dispersion, _, _, originate, receive, server_transmit = PACKET.unpack_from(data)
+            if originate != transmit:
+                continue  # A late reply to an earlier request of the burst
+            if li_vn_mode & 7 != MODE_SERVER or li_vn_mode >> 6 == 3 or not 1 <= stratum <= 15 or not server_transmit:
+                return None  # Unsynchronized server or kiss-o'-death
+            t2_ns, t3_ns = from_ntp(receive), from_ntp(server_transmit)
+            offset_ns = ((t2_ns - t1_ns) + (t3_ns - t4_ns)) // 2
+            delay_ns = max(0, (t4_ns - t1_ns) - (t3_ns - t2_ns))
+            return offset_ns, delay_ns, stratum, root_delay / 65536, root_dispersion / 65536
+
+
+def to_ntp(ns):
+    # Unix time in ns to a 64 bit NTP timestamp
+    secs, frac_ns = divmod(ns, NS_PER_S)
+    return (secs + NTP_EPOCH_OFFSET) << 32 | (frac_ns << 32) // NS_PER_S
+
+
+def from_ntp(timestamp):
+    # 64 bit NTP timestamp to Unix time in ns
+    return ((timestamp >> 32) - NTP_EPOCH_OFFSET) * NS_PER_S + ((timestamp & 0xFFFFFFFF) * NS_PER_S >> 32)
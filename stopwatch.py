@@ -0,0 +1,96 @@
+import csv
+import time
+from array import array
+from clock_engine import NS_PER_S, tick_step_ns
+
+
+class Stopwatch():
+    # Elapsed time measured with perf_counter_ns, counting down from countdown_ns when it is set.
+    # perf_counter has sub-microsecond resolution where monotonic() only advances every 15.6 ms on Windows.
+    def __init__(self, countdown_ns=0, laps=1000, counter=None):
+        self.counter = counter or time.perf_counter_ns
+        self.countdown_ns = countdown_ns  # 0 for a stopwatch
+        self.lap_size = laps
+        self.lap_elapsed = array("q", bytes(8 * laps))  # Ring buffer of the elapsed time at each lap
+        self.lap_split = array("q", bytes(8 * laps))  # and the time since the lap before
+        self.reset()
+
+    def reset(self):
+        self.running = False
+        self.start_ns = 0  # Counter reading when last started
+        self.stored_ns = 0  # Elapsed time before the last start
+        self.lap_count = 0  # Laps recorded in total, the buffer holds the last lap_size of them
+        self.expired = False  # Set when a countdown reaches zero, cleared by whoever reports it
+
+    def start(self):
+        # Read the counter first, so the work below does not count
+        now_ns = self.counter()
+        if not self.running and not (self.countdown_ns and self.stored_ns >= self.countdown_ns):
+            self.start_ns = now_ns
+            self.running = True
+
+    def stop(self):
+        now_ns = self.counter()
+        if self.running:
+            self.stored_ns += now_ns - self.start_ns
+            self.running = False
+
+    def toggle(self):
+        self.stop() if self.running else self.start()
+
+    def elapsed_ns(self, now_ns=None):
+        if not self.running:
+            return self.stored_ns
+        if now_ns is None:
+            now_ns = self.counter()
+        return self.stored_ns + now_ns - self.start_ns
+
+    def lap(self):
+        # Record the elapsed time, return the lap number
+        elapsed_ns = self.elapsed_ns()
+        prev_ns = self.lap_elapsed[(self.lap_count - 1) % self.lap_size] if self.lap_count else 0
+        i = self.lap_count % self.lap_size
+        self.lap_elapsed[i] = elapsed_ns
+        self.lap_split[i] = elapsed_ns - prev_ns
+        self.lap_count += 1
+        return self.lap_count
+
+    def laps(self):
+        # (lap number, elapsed ns, split ns) of the buffered laps, oldest first
+        first = max(0, self.lap_count - self.lap_size)
+        return [(n + 1, self.lap_elapsed[n % self.lap_size], self.lap_split[n % self.lap_size]) for n in range(first, self.lap_count)]
+
+    def export_csv(self, path, digits):
+        # Write the buffered laps with times in seconds and as shown on the display
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["lap", "elapsed_s", "split_s", "elapsed", "split"])
+            for n, elapsed_ns, split_ns in self.laps():
+                writer.writerow([n, "%.6f" % (elapsed_ns / NS_PER_S), "%.6f" % (split_ns / NS_PER_S), format_elapsed(elapsed_ns, digits), format_elapsed(split_ns, digits)])
+
+    def tick(self, digits, interval_ms):
+        # Return the text to show now and the delay (ns) until the next visible change
+        step = tick_step_ns(digits, interval_ms)
+        elapsed_ns = self.elapsed_ns()
+        if not self.countdown_ns:
+            return format_elapsed(elapsed_ns, digits), step - elapsed_ns % step if self.running else step
+        remaining_ns = max(0, self.countdown_ns - elapsed_ns)
+        if self.running and remaining_ns == 0:
+            self.stop()
+            self.stored_ns = self.countdown_ns
+            self.expired = True
+        # Round the remaining time up, so the display reaches zero when the countdown ends
+        unit = 10 ** (9 - digits)
+        text = format_elapsed(-(-remaining_ns // unit) * unit, digits)
+        if not self.running:
+            return text, step
+        return text, (remaining_ns - 1) % step + 1
+
+
+def format_elapsed(ns, digits):
+    # Format a duration as HH:MM:SS with the given number of fractional digits, hours are not wrapped
+    secs, frac_ns = divmod(ns, NS_PER_S)
+    text = "%02d:%02d:%02d" % (secs // 3600, secs // 60 % 60, secs % 60)
+    if digits > 0:
+        text += ".%0*d" % (digits, frac_ns // 10 ** (9 - digits))
+    return text
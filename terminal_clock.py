@@ -0,0 +1,169 @@
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+from clock_engine import ClockEngine, ClockZone, NS_PER_MS, NS_PER_S
+from settings_store import file_signature
+
+# The floating clock in a terminal, for machines without Tk or over SSH. Reads the same settings file
+# but never writes it. Tk, win32com and winreg are not imported.
+
+SETTINGS_CHECK_NS = NS_PER_S  # How often the settings file is checked for changes
+CUBE_LEVELS = [0, 95, 135, 175, 215, 255]  # Channel levels of the xterm 256-color cube
+
+
+def nearest_color(hex_color):
+    # Index of the xterm 256-color palette entry closest to a #RRGGBB color, None if it cannot be parsed
+    try:
+        rgb = [int(hex_color[i:i + 2], 16) for i in (1, 3, 5)]
+    except (TypeError, ValueError):
+        return None
+    cube = [min(range(6), key=lambda i: abs(CUBE_LEVELS[i] - c)) for c in rgb]
+    candidates = [(16 + 36 * cube[0] + 6 * cube[1] + cube[2], [CUBE_LEVELS[i] for i in cube])]
+    gray = max(0, min(23, round((sum(rgb) / 3 - 8) / 10)))
+    candidates.append((232 + gray, [8 + 10 * gray] * 3))
+    return min(candidates, key=lambda c: sum((a - b) ** 2 for a, b in zip(rgb, c[1])))[0]
+
+
+def enable_ansi():
+    # Windows consoles only interpret escape sequences once virtual terminal processing is switched on
+    if os.name == "nt":
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)
+        mode = ctypes.c_uint()
+        if kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            kernel32.SetConsoleMode(handle, mode.value | 0x0004)
+
+
+class TerminalRenderer():
+    # Lines of text centered in the terminal with ANSI escapes. Only the characters that changed
+    # since the last frame are rewritten, everything is redrawn when the size or the layout changes.
+    def __init__(self, out):
+        self.out = out
+        self.style = ""  # SGR sequence for the text colors
+        self.invalidate()
+
+    def invalidate(self):
+        self.lines = []
+        self.size = None
+        self.origin = (0, 0)
+
+    def set_colors(self, fg, bg):
+        # fg and bg are xterm 256-color indexes or None for the terminal's own colors
+        self.style = "\x1b[0m" + ("" if fg is None else "\x1b[38;5;%dm" % fg) + ("" if bg is None else "\x1b[48;5;%dm" % bg)
+        self.invalidate()
+
+    def render(self, lines):
+        try:
+            size = os.get_terminal_size(self.out.fileno())
+        except (OSError, ValueError):
+            size = shutil.get_terminal_size()  # Not a terminal, e.g. redirected to a file: COLUMNS/LINES or 80x24
+        if size != self.size or [len(l) for l in lines] != [len(l) for l in self.lines]:
+            self.redraw(lines, size)
+            return
+        parts = []
+        row, col = self.origin
+        for r, (old, new) in enumerate(zip(self.lines, lines)):
+            i = 0
+            while i < len(new):
+                if new[i] == old[i]:
+                    i += 1
+                    continue
+                j = i + 1
+                while j < len(new) and new[j] != old[j]:
+                    j += 1
+                parts.append("\x1b[%d;%dH%s" % (row + r + 1, col + i + 1, new[i:j]))
+                i = j
+        self.lines = lines
+        if parts:
+            self.out.write("".join(parts))
+            self.out.flush()
+
+    def redraw(self, lines, size):
+        self.size = size
+        self.lines = lines
+        width = max(len(l) for l in lines)
+        row = max(0, (size.lines - len(lines)) // 2)
+        col = max(0, (size.columns - width) // 2)
+        self.origin = (row, col)
+        parts = ["\x1b[0m\x1b[2J", self.style]
+        for r, line in enumerate(lines):
+            parts.append("\x1b[%d;%dH%s" % (row + r + 1, col + 1, line))
+        self.out.write("".join(parts))
+        self.out.flush()
+
+
+class TerminalClock():
+    # Drives a TerminalRenderer from a ClockEngine, sleeping until the next visible change
+    def __init__(self, config_file, out=sys.stdout):
+        self.config_file = config_file
+        self.out = out
+        self.renderer = TerminalRenderer(out)
+        self.clock = ClockEngine()
+        self.signature = None
+        self.next_check_ns = 0
+        self.settings = {}
+        self.zones = []  # ClockZone of each additional clock
+        self.offsets_ns = []  # Excursion of each additional clock, whole-minute UTC offsets never move a boundary
+        self.load_settings()
+
+    def load_settings(self):
+        # (Re)read the settings file, keeping the last good settings while it is missing or half written
+        self.signature = file_signature(self.config_file)
+        try:
+            with open(self.config_file, "r", encoding="utf-8") as f:
+                settings = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(settings, dict):
+            return
+        if settings.get("time_excursion", 0) != self.settings.get("time_excursion", 0):
+            self.clock.set_excursion(settings.get("time_excursion", 0))
+        self.settings = settings
+        self.zones = [ClockZone(c.get("timezone"), c.get("utc_offset_minutes")) for c in settings.get("clocks", [])]
+        self.offsets_ns = [int(c.get("time_excursion", 0)) * NS_PER_MS for c in settings.get("clocks", [])]
+        self.renderer.set_colors(nearest_color(settings.get("text_color")), nearest_color(settings.get("bg_color")))
+        self.clock.reset_schedule()
+
+    def lines(self, text, digits):
+        # The main clock, then the additional clocks of settings["clocks"]
+        lines = [text]
+        for config, zone, offset_ns in zip(self.settings.get("clocks", []), self.zones, self.offsets_ns):
+            prefix = config.get("label") or ""
+            if prefix:
+                prefix += " "
+            now_ns = self.clock.last_now_ns + offset_ns
+            lines.append(prefix + self.clock.format(now_ns, digits, zone.utc_offset_ns(now_ns)))
+        return lines
+
+    def run(self):
+        enable_ansi()
+        self.out.write("\x1b[?1049h\x1b[?25l")  # Alternate screen, hide the cursor
+        try:
+            while True:
+                now_ns = time.monotonic_ns()
+                if now_ns >= self.next_check_ns:
+                    self.next_check_ns = now_ns + SETTINGS_CHECK_NS
+                    if file_signature(self.config_file) != self.signature:
+                        self.load_settings()
+                digits = int(self.settings.get("time_precision_digits", 0))
+                # Also wake at the additional clocks' own boundaries, like the window does
+                text, delay_ns = self.clock.tick(digits, self.settings.get("sync_interval", 100), self.offsets_ns)
+                self.renderer.render(self.lines(text, digits))
+                time.sleep(max(NS_PER_MS, delay_ns) / NS_PER_S)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.out.write("\x1b[0m\x1b[?25h\x1b[?1049l")
+            self.out.flush()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show the floating clock in a terminal")
+    parser.add_argument("--settings", default=os.path.join(os.path.dirname(sys.executable), "TimeWindowSettings.json"),
+                        help="settings file, the one next to the program by default")
+    args = parser.parse_args()
+    TerminalClock(args.settings).run()
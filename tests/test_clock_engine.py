@@ -0,0 +1,141 @@
+import pytest
+from clock_engine import ClockEngine, ClockZone, VirtualTimeSource, simulate, NS_PER_MS, NS_PER_S
+from sntp import SNTPResponse
+
+START_NS = 1_700_000_000 * NS_PER_S + 123_456_789
+
+
+def engine(**kwargs):
+    return ClockEngine(source=VirtualTimeSource(wall_ns=START_NS, **kwargs))
+
+
+class FixedClient():
+    # Stands in for SNTPClient, answering every request with the same offset
+    def __init__(self, offset):
+        self.offset = offset
+        self.requests = []
+
+    def request(self, host, port=123, version=4, timeout=5):
+        self.requests.append((host, port, timeout))
+        return SNTPResponse(int(self.offset * NS_PER_S), 10 * NS_PER_MS, 1, 0, 0, 1)
+
+
+def test_sync_uses_the_injected_client():
+    client = FixedClient(0.5)
+    clock = ClockEngine(source=VirtualTimeSource(wall_ns=START_NS), ntp_client=client)
+    assert clock.sync("time.example:1123", timeout=2, slew=False) == (0.5, 0.01)
+    assert client.requests == [("time.example", 1123, 2)]
+    assert abs(clock.now_ns() - (clock.source.time_ns() + 500 * NS_PER_MS)) < NS_PER_MS
+
+
+@pytest.mark.parametrize("latency_ms", [0, 2, 10, 20])
+def test_lateness_is_compensated(latency_ms):
+    # After the lead settles, ticks land within the 1 ms rounding of after() of their boundary
+    clock = engine()
+    lateness = []
+    for _ in simulate(clock, 60, 0, 100, latency_ns=latency_ms * NS_PER_MS):
+        if clock.last_lateness is not None:
+            lateness.append(clock.last_lateness)
+    assert all(-NS_PER_MS <= late <= NS_PER_MS for late in lateness[-30:])
+
+
+@pytest.mark.parametrize("digits", [0, 1, 2])
+def test_every_value_is_shown_once(digits):
+    # At 1 ms steps the whole-ms rounding of after() plus any latency makes skips unavoidable
+    clock = engine()
+    step = 10 ** (9 - digits)
+    last = None
+    for text, _ in simulate(clock, 5, digits, 1, latency_ns=300_000):
+        value = clock.last_now_ns // step
+        if last is not None:
+            assert value == last + 1, text
+        last = value
+
+
+def test_reset_schedule_keeps_the_learned_lead():
+    # A repaint out of schedule, e.g. after a settings change, must not send the ticks late again
+    clock = engine()
+    for _ in simulate(clock, 10, 1, 100, latency_ns=10 * NS_PER_MS):
+        pass
+    clock.reset_schedule()
+    lateness = [clock.last_lateness for _ in simulate(clock, 1, 1, 100, latency_ns=10 * NS_PER_MS)]
+    # The first tick may be asked for inside the lead, after that none are late
+    assert all(late <= NS_PER_MS for late in lateness[2:])
+
+
+def test_extra_clock_boundaries():
+    # A clock shown 300 ms ahead flips its seconds on time as well
+    clock = engine()
+    offset = 300 * NS_PER_MS
+    source = clock.source
+    for _ in range(200):
+        _, delay_ns = clock.tick(0, 100, [offset])
+        shown = clock.format(clock.last_now_ns + offset, 0)
+        assert clock.format(clock.last_now_ns + offset + delay_ns - 1, 0) == shown
+        source.advance(max(1, -(-delay_ns // NS_PER_MS)) * NS_PER_MS)
+
+
+def test_zone_follows_dst():
+    # Berlin is 60 min ahead of UTC in winter and 120 min in summer, the fixed offset is only a fallback
+    zone = ClockZone("Europe/Berlin", 0)
+    if zone.zone is None:
+        pytest.skip("no time zone database")
+    winter_ns = 1_700_000_000 * NS_PER_S  # November 2023
+    assert zone.utc_offset_ns(winter_ns) == 3600 * NS_PER_S
+    assert zone.utc_offset_ns(winter_ns + 240 * 86400 * NS_PER_S) == 7200 * NS_PER_S
+    assert ClockZone("Nowhere/City", -90).utc_offset_ns(winter_ns) == -90 * 60 * NS_PER_S
+    assert ClockZone().utc_offset_ns(winter_ns) is None
+
+
+def test_wall_clock_step_reanchors():
+    clock = engine()
+    clock.tick(0, 100)
+    clock.source.advance(NS_PER_S)
+    clock.source.step(5 * NS_PER_S)
+    clock.source.advance(NS_PER_S)
+    assert abs(clock.now_ns() - clock.source.time_ns()) < NS_PER_MS
+
+
+def test_small_wall_clock_step_is_slewed():
+    # A 100 ms correction of the system time is worked off at 0.5 ms per second instead of jumping
+    clock = engine()
+    source = clock.source
+    for _ in simulate(clock, 10, 0, 1000):
+        pass
+    source.step(100 * NS_PER_MS)
+    errors = [clock.last_now_ns - source.time_ns() for _ in simulate(clock, 300, 0, 1000)]
+    assert errors[0] < -99 * NS_PER_MS
+    assert abs(errors[-1]) < NS_PER_MS
+
+
+def test_display_follows_a_drifting_wall_clock():
+    # Without any sync a monotonic clock running 30 ppm fast stays within 1 ms of the system time
+    clock = engine(drift=30e-6)
+    source = clock.source
+    errors = [clock.last_now_ns - source.time_ns() for _ in simulate(clock, 3 * 3600, 0, 1000)]
+    assert max(abs(e) for e in errors) < NS_PER_MS
+
+
+def test_drift_is_fitted():
+    # A server running 20 ppm fast against the system clock is measured from samples spread over an hour,
+    # while the monotonic clock runs 50 ppm fast against both
+    clock = engine(drift=50e-6)
+    source = clock.source
+    server_ns = lambda wall_ns: wall_ns + (wall_ns - START_NS) // 50_000
+    for _ in range(7):
+        clock.add_sync_sample(server_ns(source.time_ns()) - source.time_ns(), 10 * NS_PER_MS)
+        errors = [clock.last_now_ns - server_ns(source.time_ns()) for _ in simulate(clock, 600, 0, 1000)]
+    assert clock.drift == pytest.approx(20e-6, rel=0.05)
+    assert max(abs(e) for e in errors) < NS_PER_MS
+
+
+def test_periodic_sync_keeps_the_display_on_time():
+    # A monotonic clock 50 ppm off the wall clock and a sync every 10 min against a server that agrees
+    # with the system clock: the display must not wander off between the syncs
+    clock = engine(drift=50e-6)
+    source = clock.source
+    errors = []
+    for _ in range(36):
+        clock.add_sync_sample(0, 10 * NS_PER_MS)
+        errors += [clock.last_now_ns - source.time_ns() for _ in simulate(clock, 600, 0, 1000)]
+    assert max(abs(e) for e in errors) < NS_PER_MS
@@ -0,0 +1,29 @@
+from fonts import FontCatalog
+
+
+def catalog(names):
+    # A FontCatalog with a fixed list, so no Tk root is needed
+    fonts = FontCatalog(None)
+    fonts.lists[False] = (names, {n: i for i, n in enumerate(names)})
+    return fonts
+
+
+def test_neighbour():
+    fonts = catalog(["Arial", "Consolas", "Courier New"])
+    assert fonts.neighbour("Consolas", 1) == "Courier New"
+    assert fonts.neighbour("Consolas", -1) == "Arial"
+    assert fonts.neighbour("Courier New", 1) is None
+    assert fonts.neighbour("Arial", -1) is None
+
+
+def test_neighbour_of_a_family_not_in_the_list():
+    # "Next" starts at the first family instead of skipping it, "previous" at the last one
+    fonts = catalog(["Arial", "Consolas", "Courier New"])
+    assert fonts.neighbour("Segoe UI", 1) == "Arial"
+    assert fonts.neighbour("Segoe UI", -1) == "Courier New"
+
+
+def test_refresh_rebuilds_the_lists():
+    fonts = catalog(["Arial"])
+    fonts.refresh()
+    assert fonts.lists == {}
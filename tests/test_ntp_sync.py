@@ -0,0 +1,103 @@
+import os
+import subprocess
+import sys
+import time
+import pytest
+from ntp_standin import NTPStandIn
+from ntp_sync import NTPSyncWorker, select_truechimers
+from sntp import SNTPClient
+
+
+def run_sync(worker, servers, timeout=2.0):
+    # Poll like the window does until the worker reports, busy() read before poll()
+    assert worker.start(servers, timeout)
+    deadline = time.monotonic() + timeout + 2
+    while time.monotonic() < deadline:
+        busy = worker.busy()
+        result = worker.poll()
+        if result is not None:
+            return result
+        assert busy, "worker finished without a result"
+        time.sleep(0.005)
+    pytest.fail("no result")
+
+
+def test_burst_keeps_the_lowest_delay_sample():
+    with NTPStandIn(offset=0.25, delay=0.010, jitter=0.030, seed=1) as server:
+        host, port = server.address.rsplit(":", 1)
+        response = SNTPClient().request(host, port=int(port), timeout=2)
+    assert response.samples == 4
+    # The true offset lies within half the round trip of the measured one
+    assert abs(response.offset - 0.25) <= response.delay / 2 + 0.001
+    assert server.requests == 4
+
+
+def test_asymmetry_shows_as_offset_error():
+    # Half the difference between the two paths can not be told from a clock offset
+    with NTPStandIn(offset=0.25, delay=0.040, asymmetry=0.5, seed=1) as server:
+        host, port = server.address.rsplit(":", 1)
+        response = SNTPClient().request(host, port=int(port), timeout=2)
+    assert response.offset == pytest.approx(0.25 + 0.010, abs=0.003)
+
+
+def test_worker_sync():
+    with NTPStandIn(offset=-1.5, delay=0.005, seed=1) as server:
+        status, offset, delay, used, name = run_sync(NTPSyncWorker(), [server.address])
+    assert status == "ok"
+    assert offset == pytest.approx(-1.5, abs=0.005)
+    assert 0 <= delay < 0.05
+    assert (used, name) == (1, server.address)
+
+
+def test_worker_ignores_false_ticker():
+    with NTPStandIn(offset=0.25, delay=0.020, seed=1) as a, NTPStandIn(offset=0.25, delay=0.040, seed=2) as b, NTPStandIn(offset=3.0, delay=0.001, seed=3) as bad:
+        status, offset, _, used, name = run_sync(NTPSyncWorker(), [a.address, b.address, bad.address])
+    assert status == "ok"
+    assert offset == pytest.approx(0.25, abs=0.005)
+    assert used == 2 and name != bad.address
+
+
+def test_silent_server_does_not_hold_up_the_majority():
+    with NTPStandIn(offset=0.25, delay=0.010) as a, NTPStandIn(offset=0.25, delay=0.020) as b, NTPStandIn(loss=1.0) as silent:
+        start = time.monotonic()
+        status, offset, _, _, _ = run_sync(NTPSyncWorker(), [a.address, b.address, silent.address], timeout=3.0)
+        elapsed = time.monotonic() - start
+    assert status == "ok"
+    assert elapsed < 1.5
+
+
+def test_quitting_does_not_wait_for_a_silent_server():
+    # The query of the silent server is still running when the sync returns, exiting must not join it
+    script = """if True:
+        from ntp_standin import NTPStandIn
+        from ntp_sync import query_servers
+        from sntp import SNTPClient
+        servers = [NTPStandIn(offset=0.25, delay=0.010), NTPStandIn(offset=0.25, delay=0.020), NTPStandIn(loss=1.0)]
+        for server in servers:
+            server.start()
+        query_servers(SNTPClient(), [server.address for server in servers], 5.0)
+    """
+    start = time.monotonic()
+    subprocess.run([sys.executable, "-c", script], cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), check=True, timeout=20)
+    assert time.monotonic() - start < 3.0
+
+
+def test_unreachable_server_times_out():
+    with NTPStandIn(loss=1.0) as server:
+        start = time.monotonic()
+        status, error, _, _, _ = run_sync(NTPSyncWorker(), [server.address], timeout=0.5)
+        elapsed = time.monotonic() - start
+    assert status == "error"
+    assert elapsed < 1.0
+
+
+def test_two_disagreeing_servers_fail():
+    with NTPStandIn(offset=0.25, delay=0.005) as a, NTPStandIn(offset=2.0, delay=0.005) as b:
+        status, error, _, _, _ = run_sync(NTPSyncWorker(), [a.address, b.address])
+    assert status == "error"
+
+
+def test_select_truechimers():
+    count, chosen = select_truechimers([(0.0, 0.02, 0.01, "a"), (0.005, 0.02, 0.01, "b"), (1.0, 0.02, 0.01, "c")])
+    assert count == 2
+    assert [s[3] for s in chosen] == ["a", "b"]
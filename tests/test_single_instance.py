@@ -0,0 +1,32 @@
+import single_instance
+
+
+class Widget():
+    # Collects after() callbacks instead of running a Tk event loop
+    def __init__(self):
+        self.jobs = []
+
+    def after(self, ms, func):
+        self.jobs.append(func)
+
+
+def test_commands_are_queued_for_the_tk_thread(tmp_path):
+    key = str(tmp_path / "TimeWindowSettings.json")
+    server = single_instance.claim(key)
+    assert server is not None
+    assert single_instance.claim(key) is None
+    handled = []
+    widget = Widget()
+    server.serve(widget, handled.append)
+    try:
+        assert single_instance.send(key, "sync")
+        assert single_instance.send(key, "show")
+        assert not single_instance.send(key, "format")
+        assert handled == []  # Nothing runs on the accept thread
+        widget.jobs.pop()()
+        assert handled == ["sync", "show"]
+        assert len(widget.jobs) == 1  # Draining goes on
+    finally:
+        server.close()
+    widget.jobs.pop()()
+    assert widget.jobs == []
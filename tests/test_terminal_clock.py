@@ -0,0 +1,18 @@
+import io
+import json
+from clock_engine import ClockEngine, VirtualTimeSource, NS_PER_MS, NS_PER_S
+from terminal_clock import TerminalClock
+
+
+def test_additional_clocks_change_on_time(tmp_path):
+    # A clock with its own 300 ms excursion shows each second from its boundary, not up to a step late
+    path = tmp_path / "TimeWindowSettings.json"
+    path.write_text(json.dumps({"time_precision_digits": 0, "clocks": [{"label": "B", "time_excursion": 300}]}))
+    terminal = TerminalClock(str(path), out=io.StringIO())
+    terminal.clock = ClockEngine(source=VirtualTimeSource(wall_ns=1_700_000_000 * NS_PER_S))
+    clock = terminal.clock
+    for _ in range(50):
+        text, delay_ns = clock.tick(0, 100, terminal.offsets_ns)
+        # Still right just before the next wake
+        assert terminal.lines(text, 0)[1] == "B " + clock.format(clock.last_now_ns + delay_ns - 1 + 300 * NS_PER_MS, 0)
+        clock.source.advance(max(1, -(-delay_ns // NS_PER_MS)) * NS_PER_MS)
@@ -0,0 +1,36 @@
+from array import array
+
+NS_PER_MS = 1_000_000
+
+
+class TickStats():
+    # Fixed-size ring buffer of per-tick timestamp, lateness and work duration (all ns)
+    def __init__(self, size=1024):
+        self.size = size
+        self.stamps = array("q", bytes(8 * size))
+        self.lateness = array("q", bytes(8 * size))
+        self.work = array("q", bytes(8 * size))
+        self.count = 0  # Ticks recorded in total, the buffer holds the last size of them
+
+    def record(self, stamp_ns, lateness_ns, work_ns):
+        i = self.count % self.size
+        self.stamps[i] = stamp_ns
+        self.lateness[i] = lateness_ns
+        self.work[i] = work_ns
+        self.count += 1
+
+    def report(self):
+        # Lateness percentiles (ms), mean work (ms) and tick rate (per second) over the buffered ticks
+        n = min(self.count, self.size)
+        if n == 0:
+            return None
+        late = sorted(self.lateness[:n])
+        stamps = self.stamps[:n]
+        span = max(stamps) - min(stamps)
+        return {
+            "p50": late[n // 2] / NS_PER_MS,
+            "p99": late[min(n - 1, n * 99 // 100)] / NS_PER_MS,
+            "max": late[-1] / NS_PER_MS,
+            "work": sum(self.work[:n]) / n / NS_PER_MS,
+            "rate": (n - 1) * 1e9 / span if span else 0.0,
+        }